@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Avalanche, strict avalanche (SAC) and bit independence (BIC) analysis.
+
+For every random sample message, each input bit is flipped once and the
+772-bit output difference is accumulated in NumPy arrays:
+    flips[i, j]   how often output bit j changed when input bit i was flipped
+    pairs[j, k]   how often output bits j and k changed together
+    weights[w]    how many flips changed exactly w output bits
+Work is split into sample ranges across a process pool. Progress is saved
+to a state file after every finished range, so an interrupted run resumes
+where it stopped.
+
+    python avalanche_analysis.py --samples 10000 --length 32 --workers 8
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from model.batch import hash_many
+from model.radix_hash import BITS_PER_BLOCK, DIGEST_SIZE
+
+def _digest_bits(digests) -> np.ndarray:
+    """(n, 772) uint8 bit matrix of 97-byte digests (the 4 leading pad bits dropped)."""
+    packed = np.frombuffer(b"".join(digests), dtype=np.uint8).reshape(-1, DIGEST_SIZE)
+    return np.unpackbits(packed, axis=1)[:, 8 * DIGEST_SIZE - BITS_PER_BLOCK:]
+
+def sample_message(seed: int, index: int, length: int) -> bytes:
+    """Deterministic random message for a sample index."""
+    return np.random.default_rng([seed, index]).bytes(length)
+
+def _flipped_messages(message: bytes) -> list:
+    """The message followed by every single-bit flip of it (MSB first)."""
+    messages = [message]
+    buffer = bytearray(message)
+    for i in range(8 * len(message)):
+        buffer[i // 8] ^= 0x80 >> (i % 8)
+        messages.append(bytes(buffer))
+        buffer[i // 8] ^= 0x80 >> (i % 8)
+    return messages
+
+def analyze_range(length: int, seed: int, start: int, stop: int) -> dict:
+    """Worker: accumulate the counters for samples start..stop-1."""
+    input_bits = 8 * length
+    flips = np.zeros((input_bits, BITS_PER_BLOCK), dtype=np.int64)
+    pairs = np.zeros((BITS_PER_BLOCK, BITS_PER_BLOCK), dtype=np.int64)
+    weights = np.zeros(BITS_PER_BLOCK + 1, dtype=np.int64)
+    for index in range(start, stop):
+        bits = _digest_bits(hash_many(_flipped_messages(sample_message(seed, index, length))))
+        diff = bits[1:] ^ bits[0]
+        flips += diff
+        diff64 = diff.astype(np.int64)
+        pairs += diff64.T @ diff64
+        weights += np.bincount(diff.sum(axis=1), minlength=BITS_PER_BLOCK + 1)
+    return {"flips": flips, "pairs": pairs, "weights": weights, "samples": stop - start}
+
+class AvalancheState:
+    """Accumulated counters plus the index of the next sample to analyze."""
+
+    def __init__(self, length: int, seed: int):
+        self.length = length
+        self.seed = seed
+        self.next_sample = 0
+        self.samples = 0
+        self.flips = np.zeros((8 * length, BITS_PER_BLOCK), dtype=np.int64)
+        self.pairs = np.zeros((BITS_PER_BLOCK, BITS_PER_BLOCK), dtype=np.int64)
+        self.weights = np.zeros(BITS_PER_BLOCK + 1, dtype=np.int64)
+
+    def add(self, partial: dict) -> None:
+        self.flips += partial["flips"]
+        self.pairs += partial["pairs"]
+        self.weights += partial["weights"]
+        self.samples += partial["samples"]
+
+    def save(self, path: str) -> None:
+        tmp = path + ".tmp.npz"
+        np.savez_compressed(tmp, length=self.length, seed=self.seed,
+                            next_sample=self.next_sample, samples=self.samples,
+                            flips=self.flips, pairs=self.pairs, weights=self.weights)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str, length: int, seed: int) -> "AvalancheState":
+        with np.load(path) as data:
+            if int(data["length"]) != length or int(data["seed"]) != seed:
+                raise ValueError(f"{path} was made with length={int(data['length'])}, "
+                                 f"seed={int(data['seed'])}; refusing to mix runs")
+            state = cls(length, seed)
+            state.next_sample = int(data["next_sample"])
+            state.samples = int(data["samples"])
+            state.flips = data["flips"]
+            state.pairs = data["pairs"]
+            state.weights = data["weights"]
+        return state
+
+    def matrices(self) -> dict:
+        """Avalanche histogram, SAC matrix and BIC correlation matrix."""
+        observations = self.samples * 8 * self.length
+        sac = self.flips / max(self.samples, 1)
+        # Pearson correlation between output-bit flip indicators.
+        p = self.flips.sum(axis=0) / max(observations, 1)
+        joint = self.pairs / max(observations, 1)
+        variance = p * (1 - p)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            bic = (joint - np.outer(p, p)) / np.sqrt(np.outer(variance, variance))
+        np.fill_diagonal(bic, 1.0)
+        return {"sac": sac, "bic": np.nan_to_num(bic), "weights": self.weights}
+
+    def summary(self) -> dict:
+        m = self.matrices()
+        observations = int(self.weights.sum())
+        mean_weight = float((np.arange(BITS_PER_BLOCK + 1) * self.weights).sum() / max(observations, 1))
+        off_diagonal = np.abs(m["bic"][~np.eye(BITS_PER_BLOCK, dtype=bool)])
+        return {
+            "samples": self.samples,
+            "input_bits": 8 * self.length,
+            "flips": observations,
+            "avalanche_mean_changed_bits": mean_weight,
+            "avalanche_mean_ratio": mean_weight / BITS_PER_BLOCK,
+            "sac_mean": float(m["sac"].mean()),
+            "sac_max_abs_deviation": float(np.abs(m["sac"] - 0.5).max()),
+            "sac_mean_abs_deviation": float(np.abs(m["sac"] - 0.5).mean()),
+            "bic_max_abs_correlation": float(off_diagonal.max()) if off_diagonal.size else 0.0,
+            "bic_mean_abs_correlation": float(off_diagonal.mean()) if off_diagonal.size else 0.0,
+        }
+
+def run(samples: int, length: int, seed: int, workers: int, batch: int, state_path: str = None,
+        progress=None) -> AvalancheState:
+    """Analyze samples (resuming from state_path if present) and return the state."""
+    if state_path and os.path.exists(state_path):
+        state = AvalancheState.load(state_path, length, seed)
+    else:
+        state = AvalancheState(length, seed)
+
+    ranges = [(start, min(start + batch, samples))
+              for start in range(state.next_sample, samples, batch)]
+    if not ranges:
+        return state
+
+    def finish(stop, partial):
+        state.add(partial)
+        state.next_sample = stop
+        if state_path:
+            state.save(state_path)
+        if progress:
+            progress(state)
+
+    if workers <= 1:
+        for start, stop in ranges:
+            finish(stop, analyze_range(length, seed, start, stop))
+        return state
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(analyze_range, length, seed, start, stop) for start, stop in ranges]
+        # Ranges are committed in order so next_sample always marks a clean prefix.
+        for (start, stop), future in zip(ranges, futures):
+            finish(stop, future.result())
+    return state
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Avalanche / SAC / BIC analysis of Radix-Hash.")
+    parser.add_argument("--samples", type=int, default=1000, help="number of random messages")
+    parser.add_argument("--length", type=int, default=32, help="message length in bytes (default: 32)")
+    parser.add_argument("--seed", type=int, default=772, help="random seed")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--batch", type=int, default=50, help="samples per work item")
+    parser.add_argument("--state", default="avalanche_state.npz", help="resumable progress file")
+    parser.add_argument("--output", default="avalanche", help="prefix of the result files")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+
+    def progress(state):
+        rate = (state.samples / (time.perf_counter() - started))
+        print(f"  {state.next_sample}/{args.samples} samples ({rate:.1f} samples/s)", file=sys.stderr)
+
+    state = run(args.samples, args.length, args.seed, args.workers, args.batch, args.state, progress)
+    matrices = state.matrices()
+    np.savez_compressed(args.output + "_matrices.npz", **matrices)
+    summary = state.summary()
+    with open(args.output + "_summary.json", "w") as f:
+        json.dump(summary, f, indent=2)
+
+    print(json.dumps(summary, indent=2))
+    print(f"Matrices: {args.output}_matrices.npz, summary: {args.output}_summary.json")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Local asyncio hashing service.
+
+Serves Radix-Hash digests over TCP on localhost or a Unix socket. CPU work
+runs in a process pool; single-block requests arriving at the same time
+are coalesced into one batch job, longer H payloads are hashed as jobs of
+their own, and large inputs are streamed in block-aligned
+chunks with a bounded number of chunks in flight, so a big input never
+stalls the small ones behind it.
+
+Wire protocol (all lengths are 4-byte big-endian):
+    client -> server
+        b"H" len payload      hash a small payload (at most small_limit bytes)
+        b"S"                  start a streamed request
+        b"C" len chunk        next chunk of the streamed request
+        b"F"                  finish the streamed request
+        b"M"                  ask for metrics
+    server -> client (one response per H, F and M, in request order)
+        b"D" digest           97-byte digest
+        b"E" len message      error message (UTF-8)
+        b"J" len json         metrics
+
+    python -m controller.hash_service --port 7720
+"""
+import argparse
+import asyncio
+import collections
+import json
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from model.batch import SINGLE_BLOCK_BYTES, hash_many
+from model.radix_hash import BLOCK_MASK, DIGEST_SIZE, PAIR_BYTES, byte_view, digest_int
+
+_LENGTH = struct.Struct(">I")
+_DISCARD_BYTES = 64 * 1024
+
+class _Error:
+    """Error response queued for a connection."""
+
+    def __init__(self, message: str):
+        self.message = message
+
+def _hash_batch(messages: list) -> list:
+    """Worker: digests of a batch of small messages."""
+    return hash_many(messages)
+
+def _hash_aligned_chunk(chunk: bytes) -> int:
+    """Worker: XOR of the block hashes of one chunk of a streamed input or H payload."""
+    return digest_int(chunk, engine="int")
+
+class ServiceMetrics:
+    """Counters and recent latencies of a running service."""
+
+    def __init__(self, window: int = 1024):
+        self.requests = 0
+        self.streams = 0
+        self.errors = 0
+        self.bytes_hashed = 0
+        self.batches = 0
+        self.batched_messages = 0
+        self.latencies = collections.deque(maxlen=window)
+
+    def record(self, started: float, size: int) -> None:
+        self.requests += 1
+        self.bytes_hashed += size
+        self.latencies.append(time.perf_counter() - started)
+
+    def snapshot(self, queue_depth: int, in_flight: int) -> dict:
+        latencies = sorted(self.latencies)
+
+        def percentile(p):
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))]
+
+        return {
+            "requests": self.requests,
+            "streams": self.streams,
+            "errors": self.errors,
+            "bytes_hashed": self.bytes_hashed,
+            "batches": self.batches,
+            "avg_batch_size": self.batched_messages / self.batches if self.batches else 0.0,
+            "queue_depth": queue_depth,
+            "in_flight_jobs": in_flight,
+            "latency_ms": {
+                "p50": percentile(50) * 1000,
+                "p90": percentile(90) * 1000,
+                "p99": percentile(99) * 1000,
+                "max": (latencies[-1] if latencies else 0.0) * 1000,
+            },
+        }
+
+class HashService:
+    """
+    asyncio hashing server. Pass host/port for TCP or unix_path for a Unix
+    socket; executor defaults to a ProcessPoolExecutor with `workers` processes.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, unix_path: str = None,
+                 workers: int = None, executor=None, small_limit: int = 64 * 1024,
+                 batch_max: int = 256, batch_delay: float = 0.002,
+                 chunk_size: int = PAIR_BYTES * 1024, max_chunks_in_flight: int = 4):
+        self.host = host
+        self.port = port
+        self.unix_path = unix_path
+        self.small_limit = small_limit
+        self.batch_max = batch_max
+        self.batch_delay = batch_delay
+        # Streamed chunks are re-cut on block-pair boundaries.
+        self.chunk_size = max(PAIR_BYTES, chunk_size - chunk_size % PAIR_BYTES)
+        self.max_chunks_in_flight = max(1, max_chunks_in_flight)
+        self.metrics = ServiceMetrics()
+        self._own_executor = executor is None
+        self._executor = executor or ProcessPoolExecutor(max_workers=workers)
+        self._queue = None
+        self._in_flight = 0
+        self._server = None
+        self._batcher = None
+        self._batches = set()
+        self._connections = set()
+
+    async def start(self):
+        """Start listening; returns the bound (host, port) or the Unix path."""
+        self._queue = asyncio.Queue()
+        self._batcher = asyncio.create_task(self._batch_loop())
+        if self.unix_path:
+            self._server = await asyncio.start_unix_server(self._handle, path=self.unix_path)
+            return self.unix_path
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.host, self.port
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            connections = list(self._connections)
+            for connection in connections:
+                connection.cancel()
+            await asyncio.gather(*connections, return_exceptions=True)
+            await self._server.wait_closed()
+        if self._batcher is not None:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+        if self._batches:
+            await asyncio.gather(*self._batches, return_exceptions=True)
+        if self._own_executor:
+            self._executor.shutdown()
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    def snapshot(self) -> dict:
+        return self.metrics.snapshot(self._queue.qsize() if self._queue else 0, self._in_flight)
+
+    async def _run(self, func, arg):
+        self._in_flight += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, arg)
+        finally:
+            self._in_flight -= 1
+
+    async def _batch_loop(self) -> None:
+        """Collect small requests for up to batch_delay seconds and hash them as one job."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.batch_delay
+            while len(batch) < self.batch_max:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            # Hold a reference until the batch is done so it is not collected mid-flight.
+            task = asyncio.create_task(self._run_batch(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _run_batch(self, batch) -> None:
+        self.metrics.batches += 1
+        self.metrics.batched_messages += len(batch)
+        try:
+            digests = await self._run(_hash_batch, [message for message, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), value in zip(batch, digests):
+            if not future.done():
+                future.set_result(value)
+
+    async def _hash_small(self, payload: bytes) -> bytes:
+        """Single-block payloads go through the batcher; longer ones get their own job."""
+        started = time.perf_counter()
+        if len(payload) > SINGLE_BLOCK_BYTES:
+            value = (await self._run(_hash_aligned_chunk, payload)).to_bytes(DIGEST_SIZE, "big")
+            self.metrics.record(started, len(payload))
+            return value
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((payload, future))
+        value = await future
+        self.metrics.record(started, len(payload))
+        return value
+
+    async def _hash_stream(self, reader) -> bytes:
+        """Read C frames until F; hash aligned chunks with bounded in-flight work."""
+        started = time.perf_counter()
+        pending = collections.deque()
+        buffer = bytearray()
+        final_hash_int = 0
+        size = 0
+        while True:
+            op = await reader.readexactly(1)
+            if op == b"F":
+                break
+            if op != b"C":
+                raise ValueError(f"unexpected frame {op!r} inside a stream")
+            (length,) = _LENGTH.unpack(await reader.readexactly(_LENGTH.size))
+            size += length
+            # Frames may be up to 4 GiB; read them in pieces so at most one
+            # chunk is buffered while the in-flight window is full.
+            while length:
+                piece = await reader.readexactly(min(length, self.chunk_size - len(buffer)))
+                length -= len(piece)
+                buffer += piece
+                if len(buffer) < self.chunk_size:
+                    continue
+                pending.append(asyncio.ensure_future(self._run(_hash_aligned_chunk, bytes(buffer))))
+                buffer.clear()
+                # Backpressure: stop reading from the socket until work drains.
+                while len(pending) >= self.max_chunks_in_flight:
+                    final_hash_int ^= await pending.popleft()
+        if buffer:
+            pending.append(asyncio.ensure_future(self._run(_hash_aligned_chunk, bytes(buffer))))
+        while pending:
+            final_hash_int ^= await pending.popleft()
+        self.metrics.streams += 1
+        self.metrics.record(started, size)
+        return (final_hash_int & BLOCK_MASK).to_bytes(DIGEST_SIZE, "big")
+
+    async def _handle(self, reader, writer) -> None:
+        """Read requests and queue their responses; a writer task sends them in order."""
+        connection = asyncio.current_task()
+        self._connections.add(connection)
+        responses = asyncio.Queue()
+        sender = asyncio.create_task(self._send_responses(responses, writer))
+        try:
+            while True:
+                try:
+                    op = await reader.readexactly(1)
+                except asyncio.IncompleteReadError:
+                    break
+                if op == b"H":
+                    (length,) = _LENGTH.unpack(await reader.readexactly(_LENGTH.size))
+                    if length > self.small_limit:
+                        # Skip the payload without buffering it.
+                        await _discard(reader, length)
+                        await responses.put(_Error(f"payload over {self.small_limit} bytes, use a stream"))
+                    else:
+                        payload = await reader.readexactly(length)
+                        await responses.put(asyncio.ensure_future(self._hash_small(payload)))
+                elif op == b"S":
+                    stream = asyncio.ensure_future(self._hash_stream(reader))
+                    await responses.put(stream)
+                    # The stream owns the reader until its F frame.
+                    await asyncio.wait([stream])
+                    if stream.exception() is not None:
+                        break
+                elif op == b"M":
+                    await responses.put(self.snapshot())
+                else:
+                    await responses.put(_Error(f"unknown request type {op!r}"))
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except asyncio.CancelledError:
+            # Service shutdown; this task is the top of the connection, so
+            # end it normally instead of propagating the cancellation.
+            sender.cancel()
+        finally:
+            self._connections.discard(connection)
+            responses.put_nowait(None)
+            await asyncio.gather(sender, return_exceptions=True)
+            writer.close()
+
+    async def _send_responses(self, responses, writer) -> None:
+        while True:
+            item = await responses.get()
+            if item is None:
+                return
+            if isinstance(item, asyncio.Future):
+                try:
+                    item = await item
+                except Exception as e:
+                    self.metrics.errors += 1
+                    item = _Error(str(e) or type(e).__name__)
+            if isinstance(item, dict):
+                body = json.dumps(item).encode("utf-8")
+                frame = b"J" + _LENGTH.pack(len(body)) + body
+            elif isinstance(item, _Error):
+                body = item.message.encode("utf-8")
+                frame = b"E" + _LENGTH.pack(len(body)) + body
+            else:
+                frame = b"D" + item
+            try:
+                writer.write(frame)
+                await writer.drain()
+            except ConnectionError:
+                return
+
+async def _read_payload(reader) -> bytes:
+    (length,) = _LENGTH.unpack(await reader.readexactly(_LENGTH.size))
+    return await reader.readexactly(length)
+
+async def _discard(reader, length: int) -> None:
+    while length:
+        length -= len(await reader.readexactly(min(length, _DISCARD_BYTES)))
+
+class ServiceError(Exception):
+    """Error reported by the hashing service."""
+
+class HashClient:
+    """
+    Minimal asyncio client. Requests on one client are serialized, each
+    waiting for its response; open several clients for concurrent requests.
+    """
+
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    async def connect(cls, host: str = "127.0.0.1", port: int = 7720, unix_path: str = None):
+        if unix_path:
+            reader, writer = await asyncio.open_unix_connection(unix_path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def close(self) -> None:
+        self._writer.close()
+        await self._writer.wait_closed()
+
+    async def _response(self):
+        kind = await self._reader.readexactly(1)
+        if kind == b"D":
+            return await self._reader.readexactly(DIGEST_SIZE)
+        body = await _read_payload(self._reader)
+        if kind == b"J":
+            return json.loads(body)
+        raise ServiceError(body.decode("utf-8", "replace"))
+
+    async def hash(self, data: bytes) -> bytes:
+        """Digest of a small payload (any bytes-like object)."""
+        data = byte_view(data)
+        async with self._lock:
+            self._writer.write(b"H" + _LENGTH.pack(len(data)))
+            self._writer.write(data)
+            await self._writer.drain()
+            return await self._response()
+
+    async def hash_stream(self, chunks) -> bytes:
+        """Digest of a large input sent as an iterable of byte chunks."""
+        async with self._lock:
+            self._writer.write(b"S")
+            for chunk in chunks:
+                chunk = byte_view(chunk)
+                self._writer.write(b"C" + _LENGTH.pack(len(chunk)))
+                self._writer.write(chunk)
+                await self._writer.drain()
+            self._writer.write(b"F")
+            await self._writer.drain()
+            return await self._response()
+
+    async def metrics(self) -> dict:
+        async with self._lock:
+            self._writer.write(b"M")
+            await self._writer.drain()
+            return await self._response()
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Local Radix-Hash hashing service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7720)
+    parser.add_argument("--unix", dest="unix_path", help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes")
+    args = parser.parse_args(argv)
+    service = HashService(args.host, args.port, args.unix_path, workers=args.workers)
+    try:
+        asyncio.run(service.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
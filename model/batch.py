@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Batch hashing of many short messages.
+Inputs of up to 96 bytes fit in a single 772-bit block. For those, the
+normalize / XOR / NOT / reverse / run-length interleave stages are run for
+the whole batch at once on a NumPy bit matrix; only the base-3 conversion
+and the modular exponent chain stay per item. Without NumPy every message
+goes through the integer engine one by one.
+"""
+from model.radix_hash import (
+    BITS_PER_BLOCK, HALF_BITS, BLOCK_MASK, DIGEST_SIZE,
+    _base3_from_int, _hash_base3_int, _hash_block_value_int, byte_view, digest,
+)
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+# Longest message that still fits in one block (96 * 8 = 768 <= 772 bits).
+SINGLE_BLOCK_BYTES = BITS_PER_BLOCK // 8
+
+def _scramble_matrix(blocks):
+    """
+    Vectorized xor_not_reverse_dynamic_count for an (n, 772) uint8 bit matrix.
+    Within a run [s, e) of X, bit X[j] lands at s + j and R[j] at e + j.
+    """
+    n = blocks.shape[0]
+    x = blocks[:, :HALF_BITS] ^ blocks[:, HALF_BITS:]
+    r = (1 - x)[:, ::-1]
+
+    positions = np.arange(HALF_BITS)
+    change = np.ones((n, HALF_BITS), dtype=bool)
+    change[:, 1:] = x[:, 1:] != x[:, :-1]
+    starts = np.maximum.accumulate(np.where(change, positions, 0), axis=1)
+
+    run_ends = np.full((n, HALF_BITS), HALF_BITS)
+    run_ends[:, :-1] = np.where(change[:, 1:], positions[1:], HALF_BITS)
+    ends = np.minimum.accumulate(run_ends[:, ::-1], axis=1)[:, ::-1]
+
+    out = np.empty((n, BITS_PER_BLOCK), dtype=np.uint8)
+    np.put_along_axis(out, starts + positions, x, axis=1)
+    np.put_along_axis(out, ends + positions, r, axis=1)
+    return out
+
+# Zero bits after a 772-bit block in a 97-byte row.
+_ROW_PAD = 8 * DIGEST_SIZE - BITS_PER_BLOCK
+
+def _hash_rows(padded) -> list:
+    """Block hashes (ints) of an (n, 97) uint8 matrix, one block in the top 772 bits of each row."""
+    bits = np.unpackbits(padded, axis=1)[:, :BITS_PER_BLOCK]
+    scrambled = np.packbits(_scramble_matrix(bits), axis=1)
+
+    # Each packed row holds the 772 scrambled bits followed by 4 zero bits.
+    return [
+        _hash_base3_int(_base3_from_int(int.from_bytes(row.tobytes(), "big") >> _ROW_PAD)) & BLOCK_MASK
+        for row in scrambled
+    ]
+
+def _hash_single_blocks(messages) -> list:
+    """Hash a list of messages that are each at most SINGLE_BLOCK_BYTES long."""
+    padded = np.zeros((len(messages), DIGEST_SIZE), dtype=np.uint8)
+    for row, message in enumerate(messages):
+        padded[row, :len(message)] = np.frombuffer(message, dtype=np.uint8)
+    return [value.to_bytes(DIGEST_SIZE, "big") for value in _hash_rows(padded)]
+
+def hash_blocks(blocks, batch_size: int = 4096) -> list:
+    """
+    Hashes (ints) of raw 772-bit block values, vectorized like hash_many().
+    A message digest is the XOR of the hashes of its blocks.
+    """
+    blocks = list(blocks)
+    if not NUMPY_AVAILABLE:
+        return [_hash_block_value_int(block) for block in blocks]
+    results = []
+    for start in range(0, len(blocks), batch_size):
+        rows = b"".join((block << _ROW_PAD).to_bytes(DIGEST_SIZE, "big")
+                        for block in blocks[start:start + batch_size])
+        results.extend(_hash_rows(np.frombuffer(rows, dtype=np.uint8).reshape(-1, DIGEST_SIZE)))
+    return results
+
+def hash_many(messages, batch_size: int = 4096) -> list:
+    """
+    Hash many byte strings and return their 97-byte digests in input order.
+    Messages may be any buffer-protocol objects (str is UTF-8 encoded).
+    Results match digest() / process_block() one for one.
+    """
+    results = []
+    batch, slots = [], []
+
+    def flush():
+        for slot, value in zip(slots, _hash_single_blocks(batch)):
+            results[slot] = value
+        batch.clear()
+        slots.clear()
+
+    for message in messages:
+        message = byte_view(message)
+        if not NUMPY_AVAILABLE or not message or len(message) > SINGLE_BLOCK_BYTES:
+            # Empty and multi-block messages take the regular path.
+            results.append(digest(message, engine="int"))
+            continue
+        slots.append(len(results))
+        results.append(None)
+        batch.append(message)
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+    return results
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Block-level memoization for repetitive inputs.
+Identical 772-bit blocks always hash to the same value, so their hashes can
+be cached. Under the XOR combiner a block that appears an even number of
+times cancels out completely and never needs to be hashed at all.
+"""
+import itertools
+from collections import Counter, OrderedDict
+
+# Blocks counted together by digest_blocks(). Cancellation only pairs up
+# equal blocks inside one window, which keeps memory bounded for inputs of
+# any size; repeats across windows are still served by the LRU.
+DEFAULT_WINDOW = 65536
+
+class BlockCache:
+    """
+    Bounded LRU cache of block hashes keyed on the raw 772-bit block value.
+    Pass it as cache= to digest(), digest_int(), process_block() or RadixHash.
+    Block values of different parameter sets overlap, so a cache is bound to
+    the parameter set it is first used with (or the one given here) and
+    refuses any other until clear().
+    Not thread-safe; use one cache per thread.
+    """
+
+    def __init__(self, maxsize: int = 4096, window: int = DEFAULT_WINDOW, params=None):
+        if maxsize < 1 or window < 1:
+            raise ValueError("maxsize and window must be at least 1")
+        self.maxsize = maxsize
+        self.window = window
+        self.params = tuple(params) if params is not None else None
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.cancelled = 0   # blocks skipped because they appeared an even number of times
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def bind(self, params) -> None:
+        """Tie the cache to a parameter set; ValueError if it holds another set's hashes."""
+        params = tuple(params)
+        if self.params is None:
+            self.params = params
+        elif self.params != params:
+            raise ValueError(f"BlockCache holds block hashes of parameter set {self.params}, "
+                             f"not {params}; use one cache per parameter set")
+
+    def lookup(self, block: int, hash_block) -> int:
+        """Return the hash of block, computing it with hash_block on a miss."""
+        entries = self._entries
+        try:
+            value = entries[block]
+        except KeyError:
+            self.misses += 1
+            value = entries[block] = hash_block(block)
+            if len(entries) > self.maxsize:
+                entries.popitem(last=False)
+                self.evictions += 1
+            return value
+        self.hits += 1
+        entries.move_to_end(block)
+        return value
+
+    def digest_blocks(self, blocks, hash_block) -> int:
+        """
+        XOR of the hashes of all blocks. Blocks are counted per window of
+        `window` blocks; within a window only those with an odd count
+        contribute and each is hashed at most once.
+        """
+        final_hash_int = 0
+        blocks = iter(blocks)
+        while True:
+            counts = Counter(itertools.islice(blocks, self.window))
+            if not counts:
+                return final_hash_int
+            for block, count in counts.items():
+                if count % 2 == 0:
+                    self.cancelled += count
+                    continue
+                self.cancelled += count - 1
+                final_hash_int ^= self.lookup(block, hash_block)
+
+    def cache_info(self) -> dict:
+        """Snapshot of the cache counters."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "cancelled": self.cancelled,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "params": self.params,
+        }
+
+    def clear(self) -> None:
+        """Drop all entries, the parameter-set binding and the counters."""
+        self._entries.clear()
+        self.params = None
+        self.hits = self.misses = self.evictions = self.cancelled = 0
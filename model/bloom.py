@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Bloom filter driven by a single Radix-Hash digest per item.
+One 772-bit digest holds enough bits for many table indexes, so the k
+probe positions are carved out of it as k independent words instead of
+hashing salted copies of the item k times. Words are taken from the low
+end: every block hash is normalized into [2**770, 2 * 3**486], so the
+top bits of a digest are far from uniform and are never used. Only when
+the k words do not fit in the remaining 764 bits are the rest derived by
+double hashing from the first two words.
+
+The bit array is a bytearray, or a shared memory map when the filter is
+backed by a file, so large filters can be persisted and used by several
+processes at once.
+"""
+import math
+import mmap
+import os
+import struct
+
+from model.batch import hash_many
+from model.radix_hash import BITS_PER_BLOCK, digest_int
+
+BLOOM_MAGIC = b"RXHB"
+# Version 2 carves indexes from the low end of the digest; version 1 files
+# were built with the old layout and would report false negatives.
+BLOOM_VERSION = 2
+_HEADER = struct.Struct(">4sBQBQ")  # magic, version, bits, hashes, items added
+
+# Extra bits per index word so that reducing it modulo the table size is
+# practically unbiased.
+_BIAS_BITS = 8
+
+# Digest bits usable for index words: all but the skewed top 8.
+INDEX_BITS = BITS_PER_BLOCK - 8
+
+def derive_indexes(value: int, k: int, width: int, modulus: int = None) -> list:
+    """
+    k index words of the given bit width from one 772-bit digest value.
+    Words are taken from the least significant end, within the low
+    INDEX_BITS bits; if they do not all fit, word i (i >= 2) of the rest
+    is h1 + i * h2 built from the first two. With a modulus every word is
+    reduced modulo it.
+    """
+    if width <= 0 or width > INDEX_BITS:
+        raise ValueError(f"index width must be in 1..{INDEX_BITS}")
+    mask = (1 << width) - 1
+    direct = min(k, INDEX_BITS // width)
+    words = [(value >> (i * width)) & mask for i in range(direct)]
+    if k > direct:
+        h1 = words[0]
+        h2 = (words[1] if direct > 1 else h1 >> 1) | 1
+        words.extend((h1 + i * h2) & mask for i in range(direct, k))
+    if modulus is not None:
+        words = [w % modulus for w in words]
+    return words
+
+def optimal_parameters(capacity: int, error_rate: float) -> tuple:
+    """(number of bits, number of hashes) for capacity items at error_rate."""
+    if capacity <= 0 or not 0 < error_rate < 1:
+        raise ValueError("capacity must be positive and error_rate in (0, 1)")
+    bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+    return bits, max(1, round(bits / capacity * math.log(2)))
+
+def _item_value(item) -> int:
+    return digest_int(item, engine="int")
+
+def _item_values(items) -> list:
+    return [int.from_bytes(d, "big") for d in hash_many(items)]
+
+class BloomFilter:
+    """
+    Bloom filter over bytes-like (or str, UTF-8 encoded) items.
+
+        bf = BloomFilter.for_capacity(1_000_000, 0.001)
+        bf.add(b"hello")
+        b"hello" in bf
+    """
+
+    def __init__(self, num_bits: int, num_hashes: int, path: str = None):
+        if num_bits <= 0 or not 0 < num_hashes < 256:
+            raise ValueError("num_bits must be positive and num_hashes in 1..255")
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.width = num_bits.bit_length() + _BIAS_BITS
+        self.count = 0
+        self.path = path
+        self._file = None
+        if path is None:
+            self._bits = bytearray(-(-num_bits // 8))
+        else:
+            self._create_file(path)
+
+    @classmethod
+    def for_capacity(cls, capacity: int, error_rate: float = 0.01, path: str = None) -> "BloomFilter":
+        return cls(*optimal_parameters(capacity, error_rate), path=path)
+
+    # -- persistence -----------------------------------------------------
+
+    def _create_file(self, path: str) -> None:
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(BLOOM_MAGIC, BLOOM_VERSION, self.num_bits, self.num_hashes, 0))
+            f.truncate(_HEADER.size + -(-self.num_bits // 8))
+        self._map_file(path)
+
+    def _map_file(self, path: str) -> None:
+        self._file = open(path, "r+b")
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        self._bits = memoryview(self._map)[_HEADER.size:]
+
+    @classmethod
+    def open(cls, path: str) -> "BloomFilter":
+        """Map an existing filter file. Changes are shared with other processes mapping it."""
+        with open(path, "rb") as f:
+            header = f.read(_HEADER.size)
+            size = os.fstat(f.fileno()).st_size
+        if len(header) != _HEADER.size:
+            raise ValueError("Bloom filter file is truncated")
+        magic, version, num_bits, num_hashes, count = _HEADER.unpack(header)
+        if magic != BLOOM_MAGIC:
+            raise ValueError("not a Radix-Hash Bloom filter file")
+        if version != BLOOM_VERSION:
+            raise ValueError(f"Bloom filter file version {version} uses another index layout; "
+                             f"rebuild it (expected version {BLOOM_VERSION})")
+        if size != _HEADER.size + -(-num_bits // 8):
+            raise ValueError("Bloom filter file size does not match its bit count")
+        bf = cls.__new__(cls)
+        bf.num_bits, bf.num_hashes, bf.count, bf.path = num_bits, num_hashes, count, path
+        bf.width = num_bits.bit_length() + _BIAS_BITS
+        bf._map_file(path)
+        return bf
+
+    def save(self, path: str) -> None:
+        """Write the filter to a file loadable with BloomFilter.open()."""
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(_HEADER.pack(BLOOM_MAGIC, BLOOM_VERSION, self.num_bits, self.num_hashes, self.count))
+            f.write(self._bits)
+        os.replace(tmp, path)
+
+    def flush(self) -> None:
+        """Push the item count and bits of a file-backed filter to disk."""
+        if self._file is not None:
+            self._map[:_HEADER.size] = _HEADER.pack(BLOOM_MAGIC, BLOOM_VERSION, self.num_bits,
+                                                    self.num_hashes, self.count)
+            self._map.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self.flush()
+            self._bits.release()
+            self._map.close()
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -- bits ------------------------------------------------------------
+
+    def indexes(self, value: int) -> list:
+        """Bit positions probed for a digest value."""
+        return derive_indexes(value, self.num_hashes, self.width, self.num_bits)
+
+    def add_digest(self, value: int) -> None:
+        """Add an item by its precomputed digest value."""
+        bits = self._bits
+        for i in self.indexes(value):
+            bits[i >> 3] |= 0x80 >> (i & 7)
+        self.count += 1
+
+    def contains_digest(self, value: int) -> bool:
+        bits = self._bits
+        return all(bits[i >> 3] & (0x80 >> (i & 7)) for i in self.indexes(value))
+
+    def add(self, item) -> None:
+        self.add_digest(_item_value(item))
+
+    def __contains__(self, item) -> bool:
+        return self.contains_digest(_item_value(item))
+
+    def add_many(self, items) -> None:
+        """Add many items, hashing the short ones in batches."""
+        for value in _item_values(items):
+            self.add_digest(value)
+
+    def contains_many(self, items) -> list:
+        return [self.contains_digest(value) for value in _item_values(items)]
+
+    def __len__(self) -> int:
+        """Number of add() calls (duplicates included)."""
+        return self.count
+
+    def false_positive_rate(self) -> float:
+        """Expected false positive rate at the current item count."""
+        return (1 - math.exp(-self.num_hashes * self.count / self.num_bits)) ** self.num_hashes
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Content-addressed deduplicating store keyed by packed Radix-Hash digests.
+
+A store is a directory holding:
+    pack-<generation>.rxp   object data, appended back to back
+    index.rxi               header + entries sorted by digest
+Each index entry is the 97-byte digest followed by the object's offset and
+length in the pack (113 bytes). The index is memory-mapped and searched
+with bisect, so lookups never load it into memory. New objects are kept in
+a small pending table until flush(), which merges them into a new index
+in one sequential pass. compact() copies only the live objects into the
+next pack generation; the index names its pack, so replacing the index is
+the single atomic step of both flush() and compact().
+"""
+import bisect
+import heapq
+import mmap
+import os
+import struct
+
+from model.radix_hash import DIGEST_SIZE, PAIR_BYTES, RadixHash, byte_view, digest
+
+INDEX_MAGIC = b"RXHI"
+INDEX_NAME = "index.rxi"
+_HEADER = struct.Struct(">4sBQQ")         # magic, version, pack generation, count
+_ENTRY = struct.Struct(">%dsQQ" % DIGEST_SIZE)  # digest, offset, length
+ENTRY_SIZE = _ENTRY.size
+
+# Read size when fingerprinting files; a multiple of 193 bytes keeps every
+# chunk on a block boundary.
+CHUNK_BYTES = PAIR_BYTES * 5433
+
+def _pack_name(generation: int) -> str:
+    return "pack-%d.rxp" % generation
+
+def _check_key(key: bytes) -> bytes:
+    if len(key) != DIGEST_SIZE:
+        raise ValueError(f"content keys are {DIGEST_SIZE}-byte digests, got {len(key)} bytes")
+    return bytes(key)
+
+class _IndexKeys:
+    """Sequence view of the digests in a mapped index, for bisect."""
+
+    def __init__(self, index_map, count: int):
+        self._map = index_map
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, i: int) -> bytes:
+        pos = _HEADER.size + i * ENTRY_SIZE
+        return self._map[pos:pos + DIGEST_SIZE]
+
+class ContentStore:
+    """
+    Deduplicating object store. Objects are addressed by their 97-byte
+    digest; storing the same content twice keeps a single copy.
+    """
+
+    def __init__(self, path: str, flush_every: int = 65536, engine="int"):
+        self.path = path
+        self.flush_every = flush_every
+        self.engine = engine
+        os.makedirs(path, exist_ok=True)
+        self._pending = {}     # digest -> (offset, length), not yet in the index
+        self._removed = set()  # indexed digests to drop at the next flush
+        self._index_file = None
+        self._index_map = None
+        self._pack = None
+        self._load_index()
+
+    # -- files -----------------------------------------------------------
+
+    def _load_index(self) -> None:
+        index_path = os.path.join(self.path, INDEX_NAME)
+        if not os.path.exists(index_path):
+            self._write_index(0, iter(()))
+        self._index_file = open(index_path, "rb")
+        header = self._index_file.read(_HEADER.size)
+        if len(header) != _HEADER.size:
+            raise ValueError("content store index is truncated")
+        magic, version, self.generation, self.count = _HEADER.unpack(header)
+        if magic != INDEX_MAGIC or version != 1:
+            raise ValueError("not a Radix-Hash content store index")
+        if os.fstat(self._index_file.fileno()).st_size != _HEADER.size + self.count * ENTRY_SIZE:
+            raise ValueError("content store index size does not match its entry count")
+        self._index_map = mmap.mmap(self._index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._keys = _IndexKeys(self._index_map, self.count)
+
+        pack_path = os.path.join(self.path, _pack_name(self.generation))
+        if not os.path.exists(pack_path):
+            open(pack_path, "wb").close()
+        self._pack = open(pack_path, "r+b")
+        self._pack.seek(0, os.SEEK_END)
+
+    def _close_index(self) -> None:
+        if self._index_map is not None:
+            self._index_map.close()
+            self._index_file.close()
+            self._index_map = None
+
+    def _write_index(self, generation: int, entries) -> int:
+        """Atomically replace the index with sorted (digest, offset, length) entries."""
+        index_path = os.path.join(self.path, INDEX_NAME)
+        tmp = index_path + ".tmp"
+        count = 0
+        with open(tmp, "wb") as f:
+            f.write(bytes(_HEADER.size))
+            for entry in entries:
+                f.write(_ENTRY.pack(*entry))
+                count += 1
+            f.seek(0)
+            f.write(_HEADER.pack(INDEX_MAGIC, 1, generation, count))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, index_path)
+        return count
+
+    def close(self) -> None:
+        """Flush pending objects and release the files."""
+        if self._pack is None:
+            return
+        self.flush()
+        self._close_index()
+        self._pack.close()
+        self._pack = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -- index -----------------------------------------------------------
+
+    def _indexed(self, key: bytes, lo: int = 0):
+        """(position, entry or None) of key in the on-disk index, searching from lo."""
+        i = bisect.bisect_left(self._keys, key, lo)
+        if i < self.count and self._keys[i] == key:
+            return i, _ENTRY.unpack_from(self._index_map, _HEADER.size + i * ENTRY_SIZE)
+        return i, None
+
+    def _locate(self, key: bytes):
+        """(offset, length) of a live object, or None."""
+        if key in self._pending:
+            return self._pending[key]
+        if key in self._removed:
+            return None
+        entry = self._indexed(key)[1]
+        return entry[1:] if entry else None
+
+    def _iter_index(self):
+        for i in range(self.count):
+            yield _ENTRY.unpack_from(self._index_map, _HEADER.size + i * ENTRY_SIZE)
+
+    def __contains__(self, key: bytes) -> bool:
+        return self._locate(_check_key(key)) is not None
+
+    def __len__(self) -> int:
+        return self.count - len(self._removed) + len(self._pending)
+
+    def contains_many(self, keys) -> list:
+        """
+        Batched existence check. Keys are looked up in sorted order so each
+        bisect starts where the previous one ended; results follow input order.
+        """
+        keys = [_check_key(k) for k in keys]
+        found = [False] * len(keys)
+        lo = 0
+        for n in sorted(range(len(keys)), key=keys.__getitem__):
+            key = keys[n]
+            if key in self._pending:
+                found[n] = True
+                continue
+            lo, entry = self._indexed(key, lo)
+            found[n] = entry is not None and key not in self._removed
+        return found
+
+    # -- objects ---------------------------------------------------------
+
+    def _add(self, key: bytes, offset: int, length: int) -> None:
+        self._pending[key] = (offset, length)
+        if len(self._pending) >= self.flush_every:
+            self.flush()
+
+    def _store(self, key: bytes, data) -> bool:
+        """Append data under key unless it is already stored; True if written."""
+        if key in self._removed:
+            # Still in the pack: deleting and re-adding just revives the entry.
+            self._removed.discard(key)
+            return False
+        if self._locate(key) is not None:
+            return False
+        offset = self._pack.tell()
+        self._pack.write(data)
+        self._add(key, offset, len(data))
+        return True
+
+    def put(self, data) -> bytes:
+        """Store a bytes-like object; returns its digest."""
+        data = byte_view(data)
+        key = digest(data, engine=self.engine)
+        self._store(key, data)
+        return key
+
+    def put_many(self, blobs) -> list:
+        """Store many bytes-like objects with a single index flush; returns their digests."""
+        keys = []
+        flush_every, self.flush_every = self.flush_every, float("inf")
+        try:
+            for data in blobs:
+                keys.append(self.put(data))
+        finally:
+            self.flush_every = flush_every
+        if len(self._pending) >= self.flush_every:
+            self.flush()
+        return keys
+
+    def put_file(self, path: str) -> bytes:
+        """
+        Store a file without reading it into memory. The data is hashed
+        with the streaming engine while it is appended to the pack; if the
+        content already exists the pack is truncated back.
+        """
+        h = RadixHash(engine=self.engine)
+        offset = self._pack.tell()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(CHUNK_BYTES), b""):
+                h.update(chunk)
+                self._pack.write(chunk)
+        key = h.digest()
+        if key in self._removed:
+            self._removed.discard(key)
+        elif self._locate(key) is None:
+            self._add(key, offset, h.offset)
+            return key
+        self._pack.truncate(offset)
+        self._pack.seek(offset)
+        return key
+
+    def get(self, key: bytes) -> bytes:
+        """Return the object stored under key (KeyError if missing)."""
+        location = self._locate(_check_key(key))
+        if location is None:
+            raise KeyError(key.hex())
+        offset, length = location
+        self._pack.flush()
+        return os.pread(self._pack.fileno(), length, offset)
+
+    def remove(self, key: bytes) -> None:
+        """Drop an object. Its data stays in the pack until compact()."""
+        key = _check_key(key)
+        if self._pending.pop(key, None) is not None:
+            return
+        if self._indexed(key)[1] is None or key in self._removed:
+            raise KeyError(key.hex())
+        self._removed.add(key)
+
+    # -- maintenance -----------------------------------------------------
+
+    def flush(self) -> None:
+        """Merge pending inserts and removals into the on-disk index."""
+        if not self._pending and not self._removed:
+            return
+        self._pack.flush()
+        os.fsync(self._pack.fileno())
+        pending = sorted((key, offset, length) for key, (offset, length) in self._pending.items())
+        entries = (e for e in heapq.merge(self._iter_index(), pending) if e[0] not in self._removed)
+        self._write_index(self.generation, entries)
+        self._pending.clear()
+        self._removed.clear()
+        self._close_index()
+        self._pack.close()
+        self._load_index()
+
+    def garbage_bytes(self) -> int:
+        """Pack bytes not referenced by any live object (reclaimed by compact())."""
+        self._pack.flush()
+        live = sum(length for _, _, length in self._iter_index())
+        live += sum(length for _, length in self._pending.values())
+        live -= sum(self._indexed(key)[1][2] for key in self._removed)
+        return os.fstat(self._pack.fileno()).st_size - live
+
+    def compact(self) -> None:
+        """Copy live objects into a fresh pack generation and drop the old pack."""
+        self.flush()
+        old_pack = os.path.join(self.path, _pack_name(self.generation))
+        generation = self.generation + 1
+        new_pack = os.path.join(self.path, _pack_name(generation))
+        # Copy in pack order so the old pack is read sequentially.
+        by_offset = sorted(range(self.count),
+                           key=lambda i: _ENTRY.unpack_from(self._index_map, _HEADER.size + i * ENTRY_SIZE)[1])
+        offsets = [0] * self.count
+        with open(new_pack, "wb") as out:
+            for i in by_offset:
+                _, offset, length = _ENTRY.unpack_from(self._index_map, _HEADER.size + i * ENTRY_SIZE)
+                offsets[i] = out.tell()
+                out.write(os.pread(self._pack.fileno(), length, offset))
+            out.flush()
+            os.fsync(out.fileno())
+        entries = ((key, offsets[i], length) for i, (key, _, length) in enumerate(self._iter_index()))
+        self._write_index(generation, entries)
+        self._close_index()
+        self._pack.close()
+        os.remove(old_pack)
+        self._load_index()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Consistent-hash ring for shard routing.
+Every node gets `replicas` virtual points on a 64-bit ring, carved out of
+the low end of 772-bit digests (see derive_indexes; the skewed top bits
+are never used). One digest holds 11 points: the node name's own digest
+gives the first 11, and each further group comes from the digest of the
+name + NUL + group number, so every point is an independent digest word.
+A key is routed to the first point at or after the first 64-bit word of
+its own digest.
+"""
+import bisect
+
+from model.bloom import INDEX_BITS, derive_indexes
+from model.radix_hash import digest_int
+
+RING_BITS = 64
+POINTS_PER_DIGEST = INDEX_BITS // RING_BITS
+
+def _value(key) -> int:
+    return digest_int(key, engine="int")
+
+def node_points(node, replicas: int) -> list:
+    """The `replicas` ring positions of a node."""
+    name = node.encode("utf-8") if isinstance(node, str) else bytes(node)
+    points = []
+    group = 0
+    while len(points) < replicas:
+        seed = name if group == 0 else name + b"\0%d" % group
+        count = min(POINTS_PER_DIGEST, replicas - len(points))
+        points.extend(derive_indexes(_value(seed), count, RING_BITS))
+        group += 1
+    return points
+
+class HashRing:
+    """
+        ring = HashRing(["shard-a", "shard-b", "shard-c"])
+        ring.get_node(b"user:42")
+    """
+
+    def __init__(self, nodes=(), replicas: int = 64):
+        self.replicas = replicas
+        self._points = []   # sorted ring positions
+        self._owners = []   # node of each position
+        self._nodes = set()
+        for node in nodes:
+            self.add_node(node)
+
+    def add_node(self, node: str) -> None:
+        if node in self._nodes:
+            return
+        self._nodes.add(node)
+        for point in node_points(node, self.replicas):
+            i = bisect.bisect_left(self._points, point)
+            self._points.insert(i, point)
+            self._owners.insert(i, node)
+
+    def remove_node(self, node: str) -> None:
+        if node not in self._nodes:
+            raise KeyError(node)
+        self._nodes.discard(node)
+        keep = [(p, n) for p, n in zip(self._points, self._owners) if n != node]
+        self._points = [p for p, _ in keep]
+        self._owners = [n for _, n in keep]
+
+    @property
+    def nodes(self) -> set:
+        return set(self._nodes)
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def _start(self, key) -> int:
+        if not self._points:
+            raise LookupError("hash ring has no nodes")
+        point = derive_indexes(_value(key), 1, RING_BITS)[0]
+        return bisect.bisect_left(self._points, point) % len(self._points)
+
+    def get_node(self, key) -> str:
+        """Node responsible for a key (bytes, or str encoded as UTF-8)."""
+        return self._owners[self._start(key)]
+
+    def get_nodes(self, key, count: int) -> list:
+        """The first `count` distinct nodes clockwise from the key, for replication."""
+        count = min(count, len(self._nodes))
+        i = self._start(key)
+        found = []
+        while len(found) < count:
+            node = self._owners[i]
+            if node not in found:
+                found.append(node)
+            i = (i + 1) % len(self._points)
+        return found
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Incremental re-hashing for edited or appended documents.
+The Radix-Hash digest is the XOR of independent per-block hashes, so after
+an edit only the 772-bit blocks it touches have to be hashed again: the old
+block hash is XORed out and the new one XORed in.
+"""
+from model.radix_hash import (
+    BITS_PER_BLOCK, BLOCK_MASK, DIGEST_SIZE, _block_at, _block_function, _iter_blocks,
+    block_count, byte_view,
+)
+
+class BlockDigestState:
+    """
+    Document bytes plus the hash of every block.
+    replace_range(), append() and truncate() update the digest by re-hashing
+    only the affected blocks, including the padded last block.
+    """
+
+    def __init__(self, data: bytes = b"", engine=None):
+        self._hash_block = _block_function(engine)
+        self._data = bytearray(byte_view(data))
+        self._hashes = [self._hash_block(block) for block in _iter_blocks(self._data)]
+        self._acc = 0
+        for h in self._hashes:
+            self._acc ^= h
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @property
+    def data(self) -> bytes:
+        """Current document contents."""
+        return bytes(self._data)
+
+    def _block_value(self, k: int) -> int:
+        """Block k of the current document as a zero padded 772-bit int."""
+        return _block_at(self._data, k)
+
+    def _rehash(self, first: int, last: int) -> None:
+        """Re-hash blocks first..last-1 and drop blocks past the new end."""
+        count = block_count(len(self._data))
+        while len(self._hashes) > count:
+            self._acc ^= self._hashes.pop()
+        for k in range(first, min(last, count)):
+            new = self._hash_block(self._block_value(k))
+            if k < len(self._hashes):
+                self._acc ^= self._hashes[k]
+                self._hashes[k] = new
+            else:
+                self._hashes.append(new)
+            self._acc ^= new
+
+    def replace_range(self, offset: int, new_bytes: bytes) -> None:
+        """Overwrite bytes starting at offset; writing past the end grows the document."""
+        if not 0 <= offset <= len(self._data):
+            raise ValueError(f"offset {offset} outside document of {len(self._data)} bytes")
+        new_bytes = byte_view(new_bytes)
+        if not new_bytes:
+            return
+        end = offset + len(new_bytes)
+        self._data[offset:end] = new_bytes
+        # Bits past the old end land in the formerly padded last block at the
+        # earliest, which is already covered by first..last.
+        first = 8 * offset // BITS_PER_BLOCK
+        last = (8 * end - 1) // BITS_PER_BLOCK + 1
+        self._rehash(first, last)
+
+    def append(self, data: bytes) -> None:
+        """Append bytes to the end of the document."""
+        self.replace_range(len(self._data), data)
+
+    def truncate(self, n: int) -> None:
+        """Keep only the first n bytes of the document."""
+        if not 0 <= n <= len(self._data):
+            raise ValueError(f"cannot truncate {len(self._data)} bytes to {n}")
+        if n == len(self._data):
+            return
+        del self._data[n:]
+        last = block_count(n)
+        self._rehash(max(last - 1, 0), last)
+
+    def digest_int(self) -> int:
+        """Return the 772-bit digest as an int."""
+        return self._acc & BLOCK_MASK
+
+    def digest(self) -> bytes:
+        """Return the digest packed into 97 bytes."""
+        return self.digest_int().to_bytes(DIGEST_SIZE, "big")
+
+    def hexdigest(self) -> str:
+        """Return the digest as a hexadecimal string."""
+        return self.digest().hex()
+
+    def bitdigest(self) -> str:
+        """Return the digest as a 772-character bit string, like process_block()."""
+        return format(self.digest_int(), "0772b")
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Keyed Radix-Hash for message authentication.
+
+A plain digest is the XOR of per-block hashes and ignores block order, so
+keying it needs more than a secret prefix. With
+    K = 8-byte big-endian key length + key, zero padded to a multiple of 193 bytes
+and H the Radix-Hash digest, the tag is
+    X   = H(K ^ ipad) ^ XOR over blocks i of hash_block(block_i ^ offset_i)
+    tag = H(K ^ opad) ^ H(X as 97 bytes + 8-byte message length)
+ipad and opad repeat the bytes 0x36 and 0x5c. offset_i is a secret
+per-index mask, built like the PMAC offsets: the XOR of masks L_j over
+the set bits of gray(i + 1), where L_j is the hash of a key-derived seed
+with j mixed in. Moving, repeating or dropping blocks changes the masks
+they are hashed under, and the outer hash binds the total length.
+
+The pad states, the seed and the masks L_j are computed once per key and
+kept in a small LRU. A message then costs one block hash and one XOR per
+block, plus the two outer blocks.
+"""
+import hmac
+import struct
+from collections import OrderedDict
+
+from model.batch import hash_blocks
+from model.radix_hash import (
+    DIGEST_SIZE, ENGINES, PAIR_BYTES, RadixHash, _iter_blocks, byte_view, digest_int,
+)
+
+_KEY_LENGTH = struct.Struct(">Q")
+_MESSAGE_LENGTH = struct.Struct(">Q")
+_IPAD = 0x36
+_OPAD = 0x5C
+_MPAD = 0x6A
+
+def key_material(key: bytes) -> bytes:
+    """Length-prefixed, block-pair aligned key block that the pads are applied to."""
+    if isinstance(key, str):
+        raise TypeError("Keys must be bytes")
+    material = _KEY_LENGTH.pack(len(key)) + bytes(key)
+    return material + bytes(-len(material) % PAIR_BYTES)
+
+def _padded(material: bytes, pad: int) -> bytes:
+    return bytes(b ^ pad for b in material)
+
+def _ntz(n: int) -> int:
+    return (n & -n).bit_length() - 1
+
+def _outer_input(acc: int, length: int) -> bytes:
+    return acc.to_bytes(DIGEST_SIZE, "big") + _MESSAGE_LENGTH.pack(length)
+
+def _xor_groups(values, counts) -> list:
+    """XOR of consecutive groups of values with the given sizes."""
+    values = iter(values)
+    results = []
+    for count in counts:
+        acc = 0
+        for _ in range(count):
+            acc ^= next(values)
+        results.append(acc)
+    return results
+
+def _tweaked_blocks(state: "KeyState", data, out: list) -> int:
+    """Append the offset-masked blocks of data to out; returns how many."""
+    count = 0
+    offset = 0
+    for count, block in enumerate(_iter_blocks(data), 1):
+        offset ^= state.mask(_ntz(count))
+        out.append(block ^ offset)
+    return count
+
+class KeyState:
+    """Per-key values: inner and outer pad states and the block offset masks."""
+    __slots__ = ("inner", "outer", "_seed", "_masks")
+
+    def __init__(self, key: bytes):
+        material = key_material(key)
+        self.inner = digest_int(_padded(material, _IPAD), engine="int")
+        self.outer = digest_int(_padded(material, _OPAD), engine="int")
+        self._seed = digest_int(_padded(material, _MPAD), engine="int")
+        self._masks = ()
+
+    def mask(self, j: int) -> int:
+        """Mask L_j, derived on first use."""
+        masks = self._masks
+        if j >= len(masks):
+            # Extend a copy and publish it in one assignment, so concurrent
+            # readers never see a partly built tuple.
+            hash_block = ENGINES["int"]
+            masks += tuple(hash_block(self._seed ^ i) for i in range(len(masks), j + 1))
+            self._masks = masks
+        return masks[j]
+
+    def offset(self, index: int) -> int:
+        """Offset mask of block `index` (0-based)."""
+        gray = (index + 1) ^ ((index + 1) >> 1)
+        value = 0
+        while gray:
+            low = gray & -gray
+            value ^= self.mask(low.bit_length() - 1)
+            gray ^= low
+        return value
+
+    def finish(self, acc: int, length: int) -> int:
+        """Tag from the inner accumulator (inner state included) and the message length."""
+        return self.outer ^ digest_int(_outer_input(acc, length), engine="int")
+
+class KeyCache:
+    """LRU of KeyState objects."""
+
+    def __init__(self, maxsize: int = 128):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self._states = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def state(self, key: bytes) -> KeyState:
+        """KeyState of key, computed on first use."""
+        key = bytes(key)
+        states = self._states
+        try:
+            value = states[key]
+        except KeyError:
+            self.misses += 1
+            value = states[key] = KeyState(key)
+            if len(states) > self.maxsize:
+                states.popitem(last=False)
+            return value
+        self.hits += 1
+        states.move_to_end(key)
+        return value
+
+    def cache_info(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self), "maxsize": self.maxsize}
+
+    def clear(self) -> None:
+        self._states.clear()
+
+_default_keys = KeyCache()
+
+class KeyedRadixHash:
+    """
+    Streaming keyed hasher. Blocks are assembled by a plain RadixHash
+    whose block function applies the offset masks; the pad states are only
+    applied when the tag is produced, so checkpoint() never holds them.
+    """
+    name = "keyed-radix-hash"
+    digest_size = DIGEST_SIZE
+
+    def __init__(self, state: KeyState, inner: RadixHash, index: int = 0):
+        self._state = state
+        self._inner = inner
+        self._hash_block = inner._hash_block
+        self._index = index
+        self._offset = state.offset(index - 1) if index else 0
+        inner._hash_block = self._tweaked_block
+
+    def _tweaked_block(self, block: int) -> int:
+        self._index += 1
+        self._offset ^= self._state.mask(_ntz(self._index))
+        return self._hash_block(block ^ self._offset)
+
+    def update(self, data: bytes) -> None:
+        self._inner.update(data)
+
+    def digest(self) -> bytes:
+        inner = self._inner
+        acc = self._state.inner ^ inner._acc
+        if inner._rem_bits:
+            # Zero padded last block, like RadixHash._final_int(), under the next offset.
+            offset = self._offset ^ self._state.mask(_ntz(self._index + 1))
+            acc ^= self._hash_block((inner._rem << (inner.block_bits - inner._rem_bits)) ^ offset)
+        return self._state.finish(acc, self._inner.offset).to_bytes(DIGEST_SIZE, "big")
+
+    def hexdigest(self) -> str:
+        return self.digest().hex()
+
+    @property
+    def offset(self) -> int:
+        """Number of message bytes consumed so far."""
+        return self._inner.offset
+
+    def checkpoint(self) -> bytes:
+        """Checkpoint of the message state; resume it with from_checkpoint() and the same key."""
+        return self._inner.checkpoint()
+
+    @classmethod
+    def from_checkpoint(cls, key: bytes, state: bytes, engine=None,
+                        keys: KeyCache = None) -> "KeyedRadixHash":
+        inner = RadixHash.from_checkpoint(state, engine=engine)
+        return cls((keys or _default_keys).state(key), inner, inner.blocks_done)
+
+    def copy(self) -> "KeyedRadixHash":
+        clone = self.__class__.__new__(self.__class__)
+        clone.__dict__.update(self.__dict__)
+        clone._inner = self._inner.copy()
+        clone._inner._hash_block = clone._tweaked_block
+        return clone
+
+def new(key: bytes, data: bytes = b"", engine=None, keys: KeyCache = None) -> KeyedRadixHash:
+    """Streaming keyed hasher with the cached state of key."""
+    h = KeyedRadixHash((keys or _default_keys).state(key), RadixHash(engine=engine))
+    if data:
+        h.update(data)
+    return h
+
+def keyed_digest_int(key: bytes, data: bytes, engine=None, keys: KeyCache = None) -> int:
+    return int.from_bytes(new(key, data, engine, keys).digest(), "big")
+
+def keyed_digest(key: bytes, data: bytes, engine=None, keys: KeyCache = None) -> bytes:
+    """97-byte keyed digest of a bytes-like message."""
+    return new(key, data, engine, keys).digest()
+
+def keyed_digest_many(key: bytes, messages, keys: KeyCache = None) -> list:
+    """
+    Keyed digests of many messages under one key. The masked blocks of all
+    messages, and then all outer inputs, are hashed in batches.
+    """
+    state = (keys or _default_keys).state(key)
+    views = [byte_view(m) for m in messages]
+    tweaked = []
+    counts = [_tweaked_blocks(state, view, tweaked) for view in views]
+    accs = _xor_groups(hash_blocks(tweaked), counts)
+
+    outer_blocks, outer_counts = [], []
+    for acc, view in zip(accs, views):
+        blocks = list(_iter_blocks(_outer_input(state.inner ^ acc, len(view))))
+        outer_blocks.extend(blocks)
+        outer_counts.append(len(blocks))
+    return [(state.outer ^ value).to_bytes(DIGEST_SIZE, "big")
+            for value in _xor_groups(hash_blocks(outer_blocks), outer_counts)]
+
+def verify(key: bytes, data: bytes, tag: bytes, engine=None, keys: KeyCache = None) -> bool:
+    """Constant-time comparison of a message's keyed digest with tag."""
+    return hmac.compare_digest(keyed_digest(key, data, engine, keys=keys), bytes(tag))
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Per-block digest manifests for partial verification of large files.
+The digest is the XOR of the per-block hashes, so storing every block hash
+(97 bytes each) next to the data lets a byte range be checked by re-hashing
+only the blocks that overlap it, while the stored hashes must still XOR to
+the top-level digest.
+
+Manifest layout: header (magic, version, data length, block count,
+top-level digest) followed by one 97-byte big-endian block hash per block.
+"""
+import mmap
+import os
+import struct
+
+from model.radix_hash import (
+    BITS_PER_BLOCK, BLOCK_MASK, DIGEST_SIZE, _block_at, _block_function, _iter_blocks,
+    block_count, byte_view,
+)
+
+MANIFEST_MAGIC = b"RXHM"
+MANIFEST_SUFFIX = ".rxm"
+_HEADER = struct.Struct(">4sBQQ")
+HEADER_SIZE = _HEADER.size + DIGEST_SIZE
+
+def manifest_path_for(path: str) -> str:
+    """Default sidecar path of a file's manifest."""
+    return path + MANIFEST_SUFFIX
+
+def write_manifest(data, manifest_path: str, engine=None) -> bytes:
+    """
+    Hash a bytes-like object, writing every block hash to manifest_path.
+    Returns the top-level digest (97 bytes).
+    """
+    data = byte_view(data)
+    hash_block = _block_function(engine)
+    count = block_count(len(data))
+    final_hash_int = 0
+    with open(manifest_path, "wb") as f:
+        # The digest is only known at the end; reserve the header first.
+        f.write(bytes(HEADER_SIZE))
+        for block in _iter_blocks(data):
+            value = hash_block(block)
+            final_hash_int ^= value
+            f.write(value.to_bytes(DIGEST_SIZE, "big"))
+        digest = (final_hash_int & BLOCK_MASK).to_bytes(DIGEST_SIZE, "big")
+        f.seek(0)
+        f.write(_HEADER.pack(MANIFEST_MAGIC, 1, len(data), count) + digest)
+    return digest
+
+def write_file_manifest(path: str, manifest_path: str = None, engine=None) -> bytes:
+    """Memory-map a file and write its manifest (default: path + ".rxm")."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return write_manifest(b"", manifest_path or manifest_path_for(path), engine)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            view = memoryview(mm)
+            try:
+                return write_manifest(view, manifest_path or manifest_path_for(path), engine)
+            finally:
+                view.release()
+
+class BlockManifest:
+    """A loaded manifest. Block hashes are read from a memory map on demand."""
+
+    def __init__(self, manifest_path: str):
+        self._file = open(manifest_path, "rb")
+        try:
+            header = self._file.read(HEADER_SIZE)
+            if len(header) != HEADER_SIZE:
+                raise ValueError("manifest is truncated")
+            magic, version, self.length, self.count = _HEADER.unpack_from(header)
+            if magic != MANIFEST_MAGIC or version != 1:
+                raise ValueError("not a Radix-Hash block manifest")
+            self.digest = header[_HEADER.size:]
+            expected = HEADER_SIZE + self.count * DIGEST_SIZE
+            if os.fstat(self._file.fileno()).st_size != expected:
+                raise ValueError("manifest size does not match its block count")
+            if self.count != block_count(self.length):
+                raise ValueError("manifest block count does not match the data length")
+            self._map = (mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+                         if self.count else None)
+        except BaseException:
+            self._file.close()
+            raise
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def block_hash(self, k: int) -> int:
+        """Stored hash of block k."""
+        if not 0 <= k < self.count:
+            raise IndexError(f"block {k} out of range (0..{self.count - 1})")
+        pos = HEADER_SIZE + k * DIGEST_SIZE
+        return int.from_bytes(self._map[pos:pos + DIGEST_SIZE], "big")
+
+    def is_consistent(self) -> bool:
+        """True if the stored block hashes XOR to the stored top-level digest."""
+        final_hash_int = 0
+        for k in range(self.count):
+            final_hash_int ^= self.block_hash(k)
+        return (final_hash_int & BLOCK_MASK).to_bytes(DIGEST_SIZE, "big") == self.digest
+
+    def blocks_for_range(self, start: int, end: int) -> range:
+        """Indexes of the blocks overlapping bytes [start, end)."""
+        if not 0 <= start <= end <= self.length:
+            raise ValueError(f"range [{start}, {end}) outside data of {self.length} bytes")
+        if start == end:
+            return range(0)
+        return range(8 * start // BITS_PER_BLOCK, (8 * end - 1) // BITS_PER_BLOCK + 1)
+
+    def verify_range(self, data, start: int, end: int, engine=None) -> bool:
+        """
+        Re-hash only the blocks of data overlapping bytes [start, end) and
+        compare them with the manifest; also checks the manifest XORs to
+        its top-level digest.
+        """
+        data = byte_view(data)
+        if len(data) != self.length:
+            return False
+        hash_block = _block_function(engine)
+        for k in self.blocks_for_range(start, end):
+            if hash_block(_block_at(data, k)) != self.block_hash(k):
+                return False
+        return self.is_consistent()
+
+def verify_file_range(path: str, start: int, end: int, manifest_path: str = None,
+                      engine=None) -> bool:
+    """verify_range() for a file on disk, reading only the blocks it needs."""
+    with BlockManifest(manifest_path or manifest_path_for(path)) as manifest:
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size != manifest.length:
+                return False
+            if manifest.length == 0:
+                return manifest.verify_range(b"", start, end, engine)
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return manifest.verify_range(mm, start, end, engine)
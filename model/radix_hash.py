@@ -6,6 +6,12 @@ This module is designed to be imported by the NIST test script.
 """
 import sys
 import os
+import functools
+import collections
+import struct
+import time
+import warnings
+import zlib
 
 # M value: the power of 3 closest to 772-bit length.
 # 3**486 ≈ 770 bits, closest to the 772-bit target.
@@ -25,25 +31,29 @@ def chunks(bits: str, size=772):
     """Split a bit string into 772-bit chunks."""
     return [bits[i:i+size] for i in range(0, len(bits), size)]
 
-def bits_to_base3_int(bits: str) -> int:
-    """Convert bit string into a base-3 integer."""
+def _bits_to_base3_int_reference(bits: str) -> int:
+    """Reference digit-by-digit conversion, kept to cross-check the tables."""
     n = 0
     for bit in bits:
         n = n * 3 + (1 if bit == "0" else 2)
     return n
 
+def bits_to_base3_int(bits: str) -> int:
+    """Convert bit string into a base-3 integer."""
+    if len(bits) > 772:
+        return _bits_to_base3_int_reference(bits)
+    # Digits are 1 for "0" and 2 for "1": a constant all-ones part plus
+    # 3**k for every "1" bit, k counted from the end of the string.
+    return (3 ** len(bits) - 1) // 2 + _base3_bits_sum(int(bits, 2) if bits else 0)
+
 def normalize_bits(bits: str, target_length=771) -> str:
     """Normalize bit string to 772 bits."""
     if len(bits) == target_length:
         return bits + "1"
     return bits
 
-def _hash_block_internal(bits: str) -> str:
-    """
-    Process a single 772-bit block and return a hexadecimal string.
-    Do not call this directly from outside.
-    """
-    n = bits_to_base3_int(bits)
+def _hash_base3_int_reference(n: int) -> int:
+    """Reference exponent chain, kept to cross-check the table version."""
     hexstr = format(n, "x")
     vals = [int(ch, 16) + 2 for ch in hexstr]
 
@@ -67,18 +77,663 @@ def _hash_block_internal(bits: str) -> str:
     elif total.bit_length() == 771:
         total += 1
 
-    return format(total, "x")
+    return total
+
+@functools.lru_cache(maxsize=None)
+def _pow_table(modulus: int) -> tuple:
+    """
+    pow(hi + 2, lo + 2, modulus) for every byte value hi << 4 | lo, i.e. for
+    every pair of hex digits. Built once per modulus.
+    """
+    return tuple(pow((b >> 4) + 2, (b & 15) + 2, modulus) for b in range(256))
+
+# ---------------------------------------------------------------------------
+# Big-integer backend for the exponent chain
+#
+# "gmpy2" uses gmpy2.mpz when it is installed, "int" uses plain Python ints.
+# The default is picked at import time ("auto": gmpy2 if available) and can
+# be forced with the RADIX_HASH_BACKEND environment variable or set_backend().
+# Digests are identical on every backend.
+# ---------------------------------------------------------------------------
+
+try:
+    import gmpy2
+except ImportError:
+    gmpy2 = None
+
+BACKENDS = {"int": int}
+if gmpy2 is not None:
+    BACKENDS["gmpy2"] = gmpy2.mpz
+
+_backend = None
+_backend_number = int
+_backend_modulus = M
+_backend_table = None
+
+def set_backend(name: str) -> None:
+    """Select the big-integer backend for the exponent chain ("int" or "gmpy2")."""
+    global _backend, _backend_number, _backend_modulus, _backend_table
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown or unavailable backend: {name!r} (available: {sorted(BACKENDS)})")
+    number = _backend_number = BACKENDS[name]
+    _backend_modulus = number(M)
+    _backend_table = tuple(number(value) for value in _pow_table(M))
+    _backend = name
+
+def get_backend() -> str:
+    """Return the name of the active big-integer backend."""
+    return _backend
+
+def _default_backend() -> str:
+    requested = os.environ.get("RADIX_HASH_BACKEND", "auto").strip().lower()
+    if requested in ("", "auto"):
+        return "gmpy2" if "gmpy2" in BACKENDS else "int"
+    if requested not in BACKENDS:
+        warnings.warn(f"RADIX_HASH_BACKEND={requested!r} is not available, using 'int'")
+        return "int"
+    return requested
+
+def _exp_chain(n: int, modulus, table, number, norm_bits: int) -> int:
+    """
+    Modular exponent chain on a base-3 block value. modulus and the
+    pow table are backend numbers; norm_bits is modulus.bit_length().
+    """
+    # Hex digits are consumed in pairs from the left: with an odd digit count
+    # the last digit is left over, otherwise every byte of n is one pair.
+    ndigits = (n.bit_length() + 3) // 4 or 1
+    last = None
+    if ndigits & 1:
+        last = (n & 15) + 2
+        n >>= 4
+
+    total = number(2)
+    term = number(0)
+    for pair in n.to_bytes(ndigits // 2, "big"):
+        # term < M and table entries are tiny, one subtraction reduces it.
+        term += table[pair]
+        if term >= modulus:
+            term -= modulus
+        total = total * term % modulus
+
+    if last is not None:
+        total += last ** 3
+        if total >= modulus:
+            total -= modulus
+
+    # Normalize output
+    if total.bit_length() < norm_bits:
+        total = 2 * modulus - total
+    elif total.bit_length() == norm_bits:
+        total += 1
+
+    return int(total)
+
+# 3**486 is a 771-bit number.
+_NORM_BITS = M.bit_length()
 
-from utils.balance_transforms import xor_not_reverse_dynamic_count
+def _hash_base3_int(n: int) -> int:
+    """Run the modular exponent chain on a base-3 block value, return an int."""
+    return _exp_chain(n, _backend_modulus, _backend_table, _backend_number, _NORM_BITS)
 
-def process_block(input_data: str) -> str:
+set_backend(_default_backend())
+
+def _hash_block_internal(bits: str) -> str:
+    """
+    Process a single 772-bit block and return a hexadecimal string.
+    Do not call this directly from outside.
+    """
+    return format(_hash_base3_int(bits_to_base3_int(bits)), "x")
+
+from utils.balance_transforms import (
+    xor_not_reverse_dynamic_count, xor_not_reverse_dynamic_count_int,
+)
+
+BITS_PER_BLOCK = 772
+HALF_BITS = BITS_PER_BLOCK // 2
+BLOCK_MASK = (1 << BITS_PER_BLOCK) - 1
+
+# Digest size of the 772-bit hash when packed into bytes (772 bits -> 97 bytes).
+DIGEST_SIZE = (BITS_PER_BLOCK + 7) // 8
+
+# Two blocks span exactly 1544 bits = 193 bytes, so block pairs are byte aligned.
+PAIR_BYTES = 2 * BITS_PER_BLOCK // 8
+
+# ---------------------------------------------------------------------------
+# Native integer engine
+#
+# Each 772-bit block is kept as a Python int (first bit = most significant
+# bit) from input to digest. Results are identical to the string engine.
+# ---------------------------------------------------------------------------
+
+# Value of a block made only of "0" bits: every base-3 digit is 1.
+_BASE3_OFFSET = (3 ** BITS_PER_BLOCK - 1) // 2
+
+# _BASE3_TABLES[j][v] is the sum of 3**(8*j + k) over the set bits k of
+# byte value v. Built on first use (97 x 256 entries, roughly 3 MB) and
+# extended when a parameter set with longer blocks needs more bytes.
+_BASE3_TABLES = None
+
+def _build_base3_tables(nbytes: int = DIGEST_SIZE):
+    global _BASE3_TABLES
+    # s[v] = sum of 3**k over the set bits k of v
+    s = [0] * 256
+    for v in range(1, 256):
+        s[v] = 3 * s[v >> 1] + (v & 1)
+    tables = _BASE3_TABLES or []
+    _BASE3_TABLES = tables + [[x * 3 ** (8 * j) for x in s] for j in range(len(tables), nbytes)]
+    return _BASE3_TABLES
+
+def _base3_bits_sum(value: int) -> int:
+    """Sum of 3**k over the set bits k of a value below 2**772 (table lookups)."""
+    tables = _BASE3_TABLES or _build_base3_tables()
+    return sum(map(list.__getitem__, tables, value.to_bytes(DIGEST_SIZE, "little")))
+
+def _scramble_block_int(block: int) -> int:
+    """Integer version of xor_not_reverse_dynamic_count for a 772-bit block."""
+    return xor_not_reverse_dynamic_count_int(block, BITS_PER_BLOCK)
+
+def _base3_from_int(block: int) -> int:
+    """Integer version of bits_to_base3_int: bit at position k adds 3**k."""
+    return _BASE3_OFFSET + _base3_bits_sum(block)
+
+def _hash_block_value_int(block: int) -> int:
+    """Hash a single 772-bit block using only integer operations."""
+    return _hash_base3_int(_base3_from_int(_scramble_block_int(block)))
+
+def _hash_block_value_str(block: int) -> int:
+    """Hash a single 772-bit block through the original bit-string pipeline."""
+    chunk = format(block, "0772b")
+    normalized_chunk = normalize_bits(chunk)
+    scrambled_chunk = xor_not_reverse_dynamic_count(normalized_chunk)
+    return int(_hash_block_internal(scrambled_chunk), 16)
+
+# normalize_bits() never changes a full 772-bit block, so the integer
+# engine does not need an equivalent step.
+ENGINES = {
+    "string": _hash_block_value_str,
+    "int": _hash_block_value_int,
+}
+_engine = "string"
+
+def set_engine(name: str) -> None:
+    """Select the default block engine ("string" or "int")."""
+    global _engine
+    if name not in ENGINES:
+        raise ValueError(f"Unknown engine: {name!r} (expected one of {sorted(ENGINES)})")
+    _engine = name
+
+def get_engine() -> str:
+    """Return the name of the default block engine."""
+    return _engine
+
+def _block_function(engine=None):
+    if engine is None:
+        engine = _engine
+    try:
+        hash_block = ENGINES[engine]
+    except KeyError:
+        raise ValueError(f"Unknown engine: {engine!r} (expected one of {sorted(ENGINES)})") from None
+    if _profile is not None:
+        return _PROFILED_ENGINES[engine]
+    return hash_block
+
+# ---------------------------------------------------------------------------
+# Profiling
+#
+# Off by default. The instrumented block functions are only handed out by
+# _block_function() while profiling is enabled, so the normal path carries
+# no extra checks. Hashers created while profiling stay instrumented.
+# Work done in worker processes (workers=N) is not included.
+# ---------------------------------------------------------------------------
+
+# "bits" is block extraction from the input and "combine" the XOR into the
+# digest; both are only timed by digest_int(). "normalize" (bit-string
+# conversion and normalize_bits) only exists in the string engine.
+STAGES = ("bits", "normalize", "scramble", "base3", "chain", "combine")
+
+BlockTrace = collections.namedtuple("BlockTrace", "index block scrambled base3 hash")
+
+class _ProfileStats:
+    def __init__(self, trace=None):
+        self.trace = trace
+        self.blocks = 0
+        self.calls = dict.fromkeys(STAGES, 0)
+        self.seconds = dict.fromkeys(STAGES, 0.0)
+
+    def add(self, stage: str, seconds: float) -> None:
+        self.calls[stage] += 1
+        self.seconds[stage] += seconds
+
+    def finish_block(self, block: int, scrambled: int, base3: int, value: int) -> None:
+        if self.trace is not None:
+            self.trace(BlockTrace(self.blocks, block, scrambled, base3, value))
+        self.blocks += 1
+
+_profile = None
+
+def enable_profiling(trace=None) -> None:
+    """
+    Start collecting per-stage timers and counters (see get_stats()).
+    trace, if given, is called with a BlockTrace for every hashed block.
+    """
+    global _profile
+    _profile = _ProfileStats(trace)
+
+def disable_profiling() -> None:
+    """Stop profiling; hashers created afterwards use the plain engines."""
+    global _profile
+    _profile = None
+
+def reset_stats() -> None:
+    """Clear the collected counters, keeping profiling and the trace callback."""
+    if _profile is not None:
+        enable_profiling(_profile.trace)
+
+def get_stats() -> dict:
+    """Snapshot of the profiling counters."""
+    stats = _profile
+    if stats is None:
+        return {"enabled": False, "blocks": 0, "stages": {}}
+    return {
+        "enabled": True,
+        "blocks": stats.blocks,
+        "stages": {
+            stage: {"calls": stats.calls[stage], "seconds": stats.seconds[stage]}
+            for stage in STAGES
+        },
+    }
+
+def _profiled_block_int(block: int) -> int:
+    stats = _profile or _ProfileStats()
+    t0 = time.perf_counter()
+    scrambled = _scramble_block_int(block)
+    t1 = time.perf_counter()
+    n = _base3_from_int(scrambled)
+    t2 = time.perf_counter()
+    value = _hash_base3_int(n)
+    t3 = time.perf_counter()
+    stats.add("scramble", t1 - t0)
+    stats.add("base3", t2 - t1)
+    stats.add("chain", t3 - t2)
+    stats.finish_block(block, scrambled, n, value)
+    return value
+
+def _profiled_block_str(block: int) -> int:
+    stats = _profile or _ProfileStats()
+    t0 = time.perf_counter()
+    normalized_chunk = normalize_bits(format(block, "0772b"))
+    t1 = time.perf_counter()
+    scrambled_chunk = xor_not_reverse_dynamic_count(normalized_chunk)
+    t2 = time.perf_counter()
+    n = bits_to_base3_int(scrambled_chunk)
+    t3 = time.perf_counter()
+    value = _hash_base3_int(n)
+    t4 = time.perf_counter()
+    stats.add("normalize", t1 - t0)
+    stats.add("scramble", t2 - t1)
+    stats.add("base3", t3 - t2)
+    stats.add("chain", t4 - t3)
+    if stats.trace is not None:
+        stats.finish_block(block, int(scrambled_chunk, 2), n, value)
+    else:
+        stats.blocks += 1
+    return value
+
+_PROFILED_ENGINES = {
+    "string": _profiled_block_str,
+    "int": _profiled_block_int,
+}
+
+def _digest_blocks_profiled(blocks, hash_block) -> int:
+    """Serial XOR combine that also times block extraction and the XOR."""
+    stats = _profile or _ProfileStats()
+    perf_counter = time.perf_counter
+    final_hash_int = 0
+    blocks = iter(blocks)
+    while True:
+        t0 = perf_counter()
+        block = next(blocks, None)
+        if block is None:
+            return final_hash_int
+        stats.add("bits", perf_counter() - t0)
+        value = hash_block(block)
+        t0 = perf_counter()
+        final_hash_int ^= value
+        stats.add("combine", perf_counter() - t0)
+
+# ---------------------------------------------------------------------------
+# Parameter sets
+#
+# RadixParams describes a member of the hash family: block size, modulus
+# exponent (the modulus is 3**modulus_exponent) and output width.
+# family() builds everything derived from a parameter set once and caches
+# it. The default set is the 772-bit hash of this module; the module-level
+# functions keep their own code path for it, so its digests are unchanged.
+# Other sets are not instrumented by the profiler.
+# ---------------------------------------------------------------------------
+
+class RadixParams(collections.namedtuple("RadixParams", "block_bits modulus_exponent output_bits")):
+    """Block bits (even), modulus exponent and output bits of a Radix-Hash variant."""
+    __slots__ = ()
+
+DEFAULT_PARAMS = RadixParams(BITS_PER_BLOCK, 486, BITS_PER_BLOCK)
+
+# Named parameter sets. Shorter blocks and moduli trade output width for speed.
+PARAM_SETS = {
+    "radix-772": DEFAULT_PARAMS,
+    "radix-388": RadixParams(388, 243, 384),
+    "radix-260": RadixParams(260, 162, 256),
+}
+
+def _gcd(a: int, b: int) -> int:
+    while b:
+        a, b = b, a % b
+    return a
+
+class RadixFamily:
+    """
+    Constants and block functions of one parameter set (see family()).
+    Blocks are read in groups of group_bytes bytes holding exactly
+    group_blocks blocks, so groups are byte aligned like the 193-byte pairs.
+    """
+
+    def __init__(self, params: RadixParams):
+        params = RadixParams(*params)
+        block_bits, exponent, output_bits = params
+        if block_bits < 16:
+            raise ValueError("block_bits must be at least 16")
+        if block_bits % 2:
+            # The base-3 step reads bit pairs; the engines disagree on a lone last bit.
+            raise ValueError("block_bits must be even")
+        if exponent < 2:
+            raise ValueError("modulus_exponent must be at least 2")
+        self.params = params
+        self.block_bits = block_bits
+        self.modulus = 3 ** exponent
+        # Output normalization bound; chain results are below 2 * modulus.
+        self.norm_bits = self.modulus.bit_length()
+        if not 1 <= output_bits <= self.norm_bits + 1:
+            raise ValueError(f"output_bits must be in 1..{self.norm_bits + 1} for this modulus")
+        self.output_bits = output_bits
+        self.output_mask = (1 << output_bits) - 1
+        self.digest_size = (output_bits + 7) // 8
+        self.block_mask = (1 << block_bits) - 1
+        self.normalize_target = block_bits - 1
+        self.group_bytes = block_bits // _gcd(block_bits, 8)
+        self.group_blocks = 8 * self.group_bytes // block_bits
+        self._shifts = tuple(block_bits * i for i in reversed(range(self.group_blocks)))
+        self.base3_offset = (3 ** block_bits - 1) // 2
+        self._block_bytes = (block_bits + 7) // 8
+        self._base3_tables = None
+        self.pow_table = _pow_table(self.modulus)
+        self._backend = None
+
+    def _load_backend(self) -> None:
+        number = _backend_number
+        self._number = number
+        self._backend_modulus = number(self.modulus)
+        self._backend_table = tuple(number(value) for value in self.pow_table)
+        self._backend = _backend
+
+    def chain(self, n: int) -> int:
+        """Modular exponent chain on a base-3 block value."""
+        if self._backend != _backend:
+            self._load_backend()
+        return _exp_chain(n, self._backend_modulus, self._backend_table, self._number, self.norm_bits)
+
+    def base3(self, block: int) -> int:
+        """Base-3 value of a block: bit at position k adds 3**k."""
+        tables = self._base3_tables
+        if tables is None:
+            tables = self._base3_tables = (_BASE3_TABLES or [])[:self._block_bytes]
+            if len(tables) < self._block_bytes:
+                tables = self._base3_tables = _build_base3_tables(self._block_bytes)[:self._block_bytes]
+        return self.base3_offset + sum(map(list.__getitem__, tables,
+                                           block.to_bytes(self._block_bytes, "little")))
+
+    def hash_block_int(self, block: int) -> int:
+        return self.chain(self.base3(xor_not_reverse_dynamic_count_int(block, self.block_bits)))
+
+    def hash_block_str(self, block: int) -> int:
+        chunk = format(block, "0%db" % self.block_bits)
+        normalized_chunk = normalize_bits(chunk, self.normalize_target)
+        scrambled_chunk = xor_not_reverse_dynamic_count(normalized_chunk)
+        return self.chain(bits_to_base3_int(scrambled_chunk))
+
+    def block_function(self, engine=None):
+        if engine is None:
+            engine = _engine
+        if engine == "int":
+            return self.hash_block_int
+        if engine == "string":
+            return self.hash_block_str
+        raise ValueError(f"Unknown engine: {engine!r} (expected one of {sorted(ENGINES)})")
+
+    def iter_blocks(self, data):
+        """Yield the zero-padded blocks of a bytes-like object as ints."""
+        view = memoryview(data).cast("B")
+        group_bytes, mask, shifts = self.group_bytes, self.block_mask, self._shifts
+        full = len(view) - len(view) % group_bytes
+        for off in range(0, full, group_bytes):
+            group = int.from_bytes(view[off:off + group_bytes], "big")
+            for shift in shifts:
+                yield (group >> shift) & mask
+
+        tail = view[full:]
+        if tail:
+            block_bits = self.block_bits
+            nbits = 8 * len(tail)
+            value = int.from_bytes(tail, "big")
+            while nbits > block_bits:
+                nbits -= block_bits
+                yield value >> nbits
+                value &= (1 << nbits) - 1
+            yield value << (block_bits - nbits)
+
+    def digest_int(self, data, engine=None, workers=None, executor=None, cache=None) -> int:
+        """Hash raw bytes with this parameter set, return the output_bits wide digest as an int."""
+        data = byte_view(data)
+        hash_block = self.block_function(engine)
+        if cache is not None:
+            cache.bind(self.params)
+            return cache.digest_blocks(self.iter_blocks(data), hash_block) & self.output_mask
+        if (workers and workers > 1 or executor is not None) and len(data) >= PARALLEL_MIN_BYTES:
+            workers = workers or os.cpu_count() or 1
+            return _digest_int_parallel(data, engine or _engine, workers, executor, self.params)
+        final_hash_int = 0
+        for block in self.iter_blocks(data):
+            final_hash_int ^= hash_block(block)
+        return final_hash_int & self.output_mask
+
+    def digest(self, data, engine=None, workers=None, executor=None, cache=None) -> bytes:
+        return self.digest_int(data, engine, workers, executor, cache).to_bytes(self.digest_size, "big")
+
+@functools.lru_cache(maxsize=None)
+def _family(params: RadixParams) -> RadixFamily:
+    return RadixFamily(params)
+
+def family(params=None) -> RadixFamily:
+    """Cached RadixFamily of a parameter set (a RadixParams, a tuple or a PARAM_SETS name)."""
+    if params is None:
+        params = DEFAULT_PARAMS
+    elif isinstance(params, str):
+        try:
+            params = PARAM_SETS[params]
+        except KeyError:
+            raise ValueError(f"Unknown parameter set: {params!r} (expected one of {sorted(PARAM_SETS)})") from None
+    return _family(RadixParams(*params))
+
+def _custom_params(params):
+    """None for the default parameter set, else its RadixFamily."""
+    if params is None:
+        return None
+    fam = family(params)
+    return None if fam.params == DEFAULT_PARAMS else fam
+
+def byte_view(data) -> memoryview:
+    """
+    Flat unsigned-byte memoryview of any buffer-protocol object (bytes,
+    bytearray, memoryview, mmap, array.array, NumPy arrays, ...) without
+    copying it. A str is UTF-8 encoded as a convenience; that one copies.
+    """
+    if isinstance(data, str):
+        return memoryview(data.encode("utf-8"))
+    view = memoryview(data)
+    if not view.c_contiguous:
+        raise ValueError("non-contiguous buffers must be made contiguous before hashing "
+                         "(e.g. numpy.ascontiguousarray)")
+    if view.format == "B" and view.ndim == 1:
+        return view
+    return view.cast("B")
+
+def _iter_blocks(data):
+    """Yield the zero-padded 772-bit blocks of a bytes-like object as ints."""
+    view = memoryview(data).cast("B")
+    full = len(view) - len(view) % PAIR_BYTES
+    for off in range(0, full, PAIR_BYTES):
+        pair = int.from_bytes(view[off:off + PAIR_BYTES], "big")
+        yield pair >> BITS_PER_BLOCK
+        yield pair & BLOCK_MASK
+
+    tail = view[full:]
+    if tail:
+        nbits = 8 * len(tail)
+        value = int.from_bytes(tail, "big")
+        if nbits > BITS_PER_BLOCK:
+            nbits -= BITS_PER_BLOCK
+            yield value >> nbits
+            value &= (1 << nbits) - 1
+        yield value << (BITS_PER_BLOCK - nbits)
+
+# Inputs smaller than this are always hashed serially: below it the cost of
+# starting workers outweighs the per-block work.
+PARALLEL_MIN_BYTES = 64 * 1024
+
+def _digest_shared_range(shm_name: str, start: int, stop: int, engine: str, params=None) -> int:
+    """Worker: XOR of the block hashes of shared_memory[start:stop]."""
+    from multiprocessing import shared_memory
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        fam = _custom_params(params)
+        hash_block = _block_function(engine) if fam is None else fam.block_function(engine)
+        iter_blocks = _iter_blocks if fam is None else fam.iter_blocks
+        view = shm.buf[start:stop]
+        acc = 0
+        for block in iter_blocks(view):
+            acc ^= hash_block(block)
+        del view
+        return acc
+    finally:
+        shm.close()
+
+def _digest_int_parallel(data, engine, workers, executor=None, params=None) -> int:
+    """
+    Split the input into block-pair aligned ranges and hash them in a process
+    pool. The data is passed through shared memory, workers only receive
+    offsets. Block order does not matter because the combiner is XOR.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing import shared_memory
+
+    fam = family(params)
+    view = memoryview(data).cast("B")
+    size = len(view)
+    tasks = workers * 4
+    groups = -(-size // fam.group_bytes)
+    step = -(-groups // tasks) * fam.group_bytes
+    ranges = [(start, min(start + step, size)) for start in range(0, size, step)]
+
+    shm = shared_memory.SharedMemory(create=True, size=size)
+    try:
+        shm.buf[:size] = view
+        pool = executor or ProcessPoolExecutor(max_workers=workers)
+        try:
+            futures = [pool.submit(_digest_shared_range, shm.name, start, stop, engine, params)
+                       for start, stop in ranges]
+            final_hash_int = 0
+            for future in futures:
+                final_hash_int ^= future.result()
+        finally:
+            if executor is None:
+                pool.shutdown()
+    finally:
+        shm.close()
+        shm.unlink()
+    return final_hash_int & fam.output_mask
+
+def _block_at(data, k: int) -> int:
+    """Block k of a bytes-like object as a zero padded 772-bit int (random access)."""
+    start_bit = k * BITS_PER_BLOCK
+    end_bit = min(start_bit + BITS_PER_BLOCK, 8 * len(data))
+    piece = data[start_bit // 8:-(-end_bit // 8)]
+    available = 8 * len(piece) - start_bit % 8
+    value = int.from_bytes(piece, "big") & ((1 << available) - 1)
+    if available >= BITS_PER_BLOCK:
+        return value >> (available - BITS_PER_BLOCK)
+    return value << (BITS_PER_BLOCK - available)
+
+def block_count(size: int) -> int:
+    """Number of (zero padded) 772-bit blocks for an input of size bytes."""
+    return -(-8 * size // BITS_PER_BLOCK)
+
+def digest_int(data: bytes, engine=None, workers=None, executor=None, cache=None,
+               params=None) -> int:
+    """
+    Hash raw bytes and return the 772-bit digest as an int.
+    data may be any buffer-protocol object (see byte_view()); it is read
+    in place, so peak memory stays close to the size of the input. The
+    parallel path copies it once into shared memory.
+    With workers > 1 (or an executor) inputs of at least PARALLEL_MIN_BYTES
+    are split across a process pool. A BlockCache (model.block_cache) skips
+    repeated blocks instead; it is not used by the parallel path.
+    params selects another parameter set (see family()).
+    """
+    data = byte_view(data)
+    fam = _custom_params(params)
+    if fam is not None:
+        return fam.digest_int(data, engine, workers, executor, cache)
+    hash_block = _block_function(engine)
+    if cache is not None:
+        cache.bind(DEFAULT_PARAMS)
+        return cache.digest_blocks(_iter_blocks(data), hash_block) & BLOCK_MASK
+    if (workers and workers > 1 or executor is not None) and len(data) >= PARALLEL_MIN_BYTES:
+        workers = workers or os.cpu_count() or 1
+        return _digest_int_parallel(data, engine or _engine, workers, executor)
+    if _profile is not None:
+        return _digest_blocks_profiled(_iter_blocks(data), hash_block) & BLOCK_MASK
+
+    final_hash_int = 0
+    for block in _iter_blocks(data):
+        final_hash_int ^= hash_block(block)
+    return final_hash_int & BLOCK_MASK
+
+def digest(data: bytes, engine=None, workers=None, executor=None, cache=None,
+           params=None) -> bytes:
+    """Hash raw bytes and return the digest packed into 97 bytes (digest_size of params)."""
+    size = DIGEST_SIZE if params is None else family(params).digest_size
+    return digest_int(data, engine, workers, executor, cache, params).to_bytes(size, "big")
+
+def process_block(input_data: str, engine=None, workers=None, cache=None, params=None) -> str:
     """
     Function called by the main test script.
     Accepts text input, computes hash, returns 772-bit string.
+    Binary input (any buffer-protocol object) is hashed as is, without
+    decoding; text is hashed as its UTF-8 bytes.
     Multi-block inputs are XORed together.
     Scrambling: XOR + NOT + reverse + dynamic count interleave.
+    engine selects "string" (reference) or "int"; default is get_engine().
+    workers > 1 hashes large inputs on several processes; cache takes a
+    BlockCache for repetitive inputs. params selects another parameter set;
+    the result is then output_bits long.
     """
-    BITS_PER_BLOCK = 772
+    fam = _custom_params(params)
+    if fam is not None:
+        value = fam.digest_int(input_data, engine, workers, cache=cache)
+        return format(value, "0%db" % fam.output_bits)
+    if (not isinstance(input_data, str) or _block_function(engine) is not _hash_block_value_str
+            or workers or cache is not None):
+        return format(digest_int(input_data, engine, workers, cache=cache), "0772b")
 
     bits = pad_bits(text_to_bits(input_data), BITS_PER_BLOCK)
     bit_chunks = chunks(bits, BITS_PER_BLOCK)
@@ -93,3 +748,192 @@ def process_block(input_data: str) -> str:
 
     final_hash_int &= ((1 << BITS_PER_BLOCK) - 1)
     return bin(final_hash_int)[2:].zfill(BITS_PER_BLOCK)
+
+# Checkpoint layout: magic, version, byte offset, pending bit count,
+# accumulator (97 bytes), pending bits (97 bytes), CRC-32 of everything before.
+CHECKPOINT_MAGIC = b"RXHC"
+_CHECKPOINT_HEADER = struct.Struct(">4sBQH")
+CHECKPOINT_SIZE = _CHECKPOINT_HEADER.size + 2 * DIGEST_SIZE + 4
+
+# hash_file_resumable() prefixes the hasher checkpoint with the identity of
+# the file it belongs to: size, mtime in nanoseconds and inode.
+_FILE_IDENTITY = struct.Struct(">QQQ")
+
+class RadixHash:
+    """
+    Streaming Radix-Hash object with a hashlib-like interface.
+    Only the XOR accumulator and the unfinished part of the current
+    772-bit block are kept in memory, so inputs of any size can be hashed.
+    For the same UTF-8 bytes the digest equals process_block().
+    params selects another parameter set (see family()); checkpoints are
+    only available for the default one.
+    """
+    name = "radix-hash"
+    block_bits = 772
+    digest_size = DIGEST_SIZE
+    params = DEFAULT_PARAMS
+    _output_mask = BLOCK_MASK
+
+    def __init__(self, data: bytes = b"", engine=None, cache=None, params=None):
+        fam = _custom_params(params)
+        if fam is None:
+            self._hash_block = _block_function(engine)
+        else:
+            self._hash_block = fam.block_function(engine)
+            self.params = fam.params
+            self.block_bits = fam.block_bits
+            self.digest_size = fam.digest_size
+            self._output_mask = fam.output_mask
+        if cache is not None:
+            cache.bind(self.params)
+            self._hash_block = functools.partial(cache.lookup, hash_block=self._hash_block)
+        self._acc = 0
+        self._rem = 0        # pending bits of the current block
+        self._rem_bits = 0   # number of pending bits (always < 772)
+        self._length = 0     # total number of bytes consumed
+        if data:
+            self.update(data)
+
+    def update(self, data: bytes) -> None:
+        """Feed more bytes into the hash."""
+        if isinstance(data, str):
+            raise TypeError("Strings must be encoded before hashing")
+        view = byte_view(data)
+        size = len(view)
+        self._length += size
+
+        block_bits = self.block_bits
+        pos = 0
+        while pos < size:
+            # Take just enough bytes to complete the current block.
+            need = (block_bits - self._rem_bits + 7) // 8
+            piece = view[pos:pos + need]
+            pos += len(piece)
+            value = (self._rem << (8 * len(piece))) | int.from_bytes(piece, "big")
+            nbits = self._rem_bits + 8 * len(piece)
+            if nbits < block_bits:
+                self._rem, self._rem_bits = value, nbits
+                break
+            extra = nbits - block_bits
+            self._acc ^= self._hash_block(value >> extra)
+            self._rem = value & ((1 << extra) - 1)
+            self._rem_bits = extra
+
+    def _final_int(self) -> int:
+        acc = self._acc
+        if self._rem_bits:
+            # Last block is zero padded, exactly like pad_bits().
+            acc ^= self._hash_block(self._rem << (self.block_bits - self._rem_bits))
+        return acc & self._output_mask
+
+    def digest(self) -> bytes:
+        """Return the 772-bit digest packed into 97 bytes (big endian)."""
+        return self._final_int().to_bytes(self.digest_size, "big")
+
+    def hexdigest(self) -> str:
+        """Return the digest as a hexadecimal string."""
+        return self.digest().hex()
+
+    def bitdigest(self) -> str:
+        """Return the digest as a 772-character bit string, like process_block()."""
+        return format(self._final_int(), "0%db" % self.params.output_bits)
+
+    @property
+    def offset(self) -> int:
+        """Number of input bytes consumed so far."""
+        return self._length
+
+    @property
+    def blocks_done(self) -> int:
+        """Number of complete 772-bit blocks hashed so far."""
+        return 8 * self._length // self.block_bits
+
+    def checkpoint(self) -> bytes:
+        """Serialize the hash state into a compact binary checkpoint."""
+        if self.params != DEFAULT_PARAMS:
+            raise ValueError("checkpoints are only supported for the default parameter set")
+        body = (_CHECKPOINT_HEADER.pack(CHECKPOINT_MAGIC, 1, self._length, self._rem_bits)
+                + self._acc.to_bytes(DIGEST_SIZE, "big")
+                + self._rem.to_bytes(DIGEST_SIZE, "big"))
+        return body + struct.pack(">I", zlib.crc32(body))
+
+    @classmethod
+    def from_checkpoint(cls, state: bytes, engine=None, cache=None) -> "RadixHash":
+        """Restore a hasher from checkpoint(); feeding the rest of the input gives the full digest."""
+        state = bytes(state)
+        if len(state) != CHECKPOINT_SIZE:
+            raise ValueError(f"checkpoint must be {CHECKPOINT_SIZE} bytes, got {len(state)}")
+        body, (crc,) = state[:-4], struct.unpack(">I", state[-4:])
+        if zlib.crc32(body) != crc:
+            raise ValueError("checkpoint is corrupt (CRC mismatch)")
+        magic, version, length, rem_bits = _CHECKPOINT_HEADER.unpack_from(body)
+        if magic != CHECKPOINT_MAGIC or version != 1:
+            raise ValueError("not a Radix-Hash checkpoint")
+        if rem_bits >= cls.block_bits or rem_bits != (8 * length) % cls.block_bits:
+            raise ValueError("checkpoint has an inconsistent partial block")
+
+        h = cls(engine=engine, cache=cache)
+        pos = _CHECKPOINT_HEADER.size
+        h._acc = int.from_bytes(body[pos:pos + DIGEST_SIZE], "big")
+        h._rem = int.from_bytes(body[pos + DIGEST_SIZE:], "big")
+        h._rem_bits = rem_bits
+        h._length = length
+        return h
+
+    def copy(self) -> "RadixHash":
+        """Return an independent copy of the current hash state."""
+        clone = self.__class__.__new__(self.__class__)
+        clone.__dict__.update(self.__dict__)
+        return clone
+
+def _write_checkpoint(path: str, state: bytes) -> None:
+    """Atomically replace the checkpoint file."""
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(state)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+def hash_file_resumable(path: str, checkpoint_path: str, checkpoint_every: int = 100000,
+                        engine=None) -> bytes:
+    """
+    Hash a file, saving the hasher state to checkpoint_path every
+    checkpoint_every blocks. If the checkpoint exists the run resumes from
+    its byte offset; the digest equals an uninterrupted run. The checkpoint
+    records the file's size, mtime and inode, and resuming is refused with
+    ValueError if the file no longer matches. The checkpoint is removed
+    once the digest has been computed.
+    """
+    if checkpoint_every < 1:
+        raise ValueError("checkpoint_every must be at least 1")
+    # Whole block pairs per window, so every checkpoint sits on a block boundary.
+    window = -(-checkpoint_every // 2) * PAIR_BYTES
+
+    with open(path, "rb") as f:
+        st = os.fstat(f.fileno())
+        identity = _FILE_IDENTITY.pack(st.st_size, st.st_mtime_ns, st.st_ino)
+        if os.path.exists(checkpoint_path):
+            with open(checkpoint_path, "rb") as cp:
+                saved = cp.read()
+            if saved[:_FILE_IDENTITY.size] != identity:
+                raise ValueError(f"checkpoint {checkpoint_path} does not belong to the current "
+                                 f"contents of {path}; delete it to start over")
+            h = RadixHash.from_checkpoint(saved[_FILE_IDENTITY.size:], engine=engine)
+        else:
+            h = RadixHash(engine=engine)
+
+        if h.offset > st.st_size:
+            raise ValueError(f"checkpoint offset {h.offset} is beyond the end of {path}")
+        f.seek(h.offset)
+        # Re-align the first window if the checkpoint came from another setting.
+        piece = f.read(window - h.offset % window)
+        while piece:
+            h.update(piece)
+            _write_checkpoint(checkpoint_path, identity + h.checkpoint())
+            piece = f.read(window)
+
+    result = h.digest()
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    return result
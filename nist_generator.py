@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+NIST STS input generator for Radix-Hash.
+
+Concatenates 772-bit digests into one bit stream and writes it to disk in
+streaming order, either packed binary (STS input format 1) or ASCII
+'0'/'1' (format 0). Digests come from counter-based seeds
+("<prefix><counter>") or from the lines of a seed file, and are computed
+across a process pool in chunks; only a bounded number of chunks is held
+in memory at any time.
+
+    python nist_generator.py --bits 1000000 --streams 100 --format binary \
+        --output results/nist_test_data.bin --workers 8
+"""
+import argparse
+import io
+import itertools
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from model.batch import hash_many
+from model.radix_hash import BITS_PER_BLOCK, process_block
+
+# Digests per work item. Must be even: two digests are exactly 193 bytes,
+# so every chunk is byte aligned in the packed stream.
+DEFAULT_CHUNK = 1024
+
+def _pack_digests(digests) -> bytes:
+    """
+    Concatenate 97-byte digests as a continuous stream of 772-bit values.
+    An odd count does not fill the last byte; the stream is left aligned
+    so the 4 pad bits go at the end rather than before the first digest.
+    """
+    stream = 0
+    for value in digests:
+        stream = (stream << BITS_PER_BLOCK) | int.from_bytes(value, "big")
+    stream <<= -len(digests) * BITS_PER_BLOCK % 8
+    return stream.to_bytes(-(-len(digests) * BITS_PER_BLOCK // 8), "big")
+
+def _counter_chunk(args) -> bytes:
+    """Worker: packed bits for digests of prefix+counter, counter in [start, stop)."""
+    prefix, start, stop = args
+    return _pack_digests(hash_many(prefix + str(i).encode("ascii") for i in range(start, stop)))
+
+def _message_chunk(messages) -> bytes:
+    """Worker: packed bits for the digests of a list of seed messages."""
+    return _pack_digests(hash_many(messages))
+
+def counter_jobs(prefix: bytes, start: int, count: int, chunk: int):
+    for first in range(start, start + count, chunk):
+        yield _counter_chunk, (prefix, first, min(first + chunk, start + count))
+
+def file_jobs(path: str, count: int, chunk: int):
+    """Seed messages are the lines of a file (without line endings)."""
+    with open(path, "rb") as f:
+        lines = (line.rstrip(b"\r\n") for line in f)
+        lines = itertools.islice(lines, count)
+        while True:
+            messages = list(itertools.islice(lines, chunk))
+            if not messages:
+                return
+            yield _message_chunk, messages
+
+def _ordered_results(jobs, workers: int, window: int):
+    """Run jobs on a pool, yielding results in submission order with bounded look-ahead."""
+    if workers <= 1:
+        for func, arg in jobs:
+            yield func(arg)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = []
+        for func, arg in jobs:
+            pending.append(pool.submit(func, arg))
+            if len(pending) >= window:
+                yield pending.pop(0).result()
+        for future in pending:
+            yield future.result()
+
+class StreamWriter:
+    """Writes exactly total_bits bits from packed chunks, as binary or ASCII."""
+
+    def __init__(self, out, total_bits: int, fmt: str):
+        self.out = out
+        self.remaining = total_bits
+        self.fmt = fmt
+
+    def write(self, packed: bytes) -> None:
+        nbits = min(8 * len(packed), self.remaining)
+        if nbits <= 0:
+            return
+        if self.fmt == "ascii":
+            bits = format(int.from_bytes(packed, "big"), f"0{8 * len(packed)}b")
+            self.out.write(bits[:nbits].encode("ascii"))
+        else:
+            nbytes = -(-nbits // 8)
+            data = bytearray(packed[:nbytes])
+            if nbits % 8:
+                # Zero the unused low bits of the final byte.
+                data[-1] &= (0xFF << (8 - nbits % 8)) & 0xFF
+            self.out.write(data)
+        self.remaining -= nbits
+
+def generate(out, total_bits: int, fmt: str = "binary", prefix: bytes = b"", start: int = 0,
+             seed_file: str = None, workers: int = 1, chunk: int = DEFAULT_CHUNK) -> dict:
+    """Write a total_bits long stream to the binary file object out; returns throughput stats."""
+    if chunk < 2 or chunk % 2:
+        raise ValueError("chunk must be a positive even number of digests")
+    digests = -(-total_bits // BITS_PER_BLOCK)
+    if seed_file:
+        jobs = file_jobs(seed_file, digests, chunk)
+    else:
+        jobs = counter_jobs(prefix, start, digests, chunk)
+
+    writer = StreamWriter(out, total_bits, fmt)
+    started = time.perf_counter()
+    for packed in _ordered_results(jobs, workers, window=2 * max(workers, 1)):
+        writer.write(packed)
+    elapsed = time.perf_counter() - started
+    if writer.remaining:
+        raise ValueError(f"seed file ran out: {writer.remaining} bits short of {total_bits}")
+    return {
+        "bits": total_bits,
+        "digests": digests,
+        "seconds": elapsed,
+        "bits_per_s": total_bits / elapsed if elapsed > 0 else 0.0,
+        "digests_per_s": digests / elapsed if elapsed > 0 else 0.0,
+    }
+
+def verify(total_bits: int, prefix: bytes = b"", start: int = 0, chunk: int = DEFAULT_CHUNK) -> bool:
+    """
+    Check the first total_bits of a counter stream against the concatenated
+    process_block() bit strings of the same seeds.
+    """
+    out = io.BytesIO()
+    generate(out, total_bits, "ascii", prefix, start, chunk=chunk)
+    digests = -(-total_bits // BITS_PER_BLOCK)
+    expected = "".join(process_block(prefix + str(i).encode("ascii"), engine="int")
+                       for i in range(start, start + digests))
+    return out.getvalue().decode("ascii") == expected[:total_bits]
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Generate NIST STS input streams from Radix-Hash digests.")
+    parser.add_argument("--bits", type=int, default=1000000, help="bits per stream (default: 1000000)")
+    parser.add_argument("--streams", type=int, default=1, help="number of streams (default: 1)")
+    parser.add_argument("--format", choices=("binary", "ascii"), default="ascii",
+                        help="packed binary or ASCII '0'/'1' (default: ascii)")
+    parser.add_argument("--output", default="results/nist_test_data.txt", help="output file")
+    parser.add_argument("--prefix", default="", help="counter seed prefix")
+    parser.add_argument("--start", type=int, default=0, help="first counter value")
+    parser.add_argument("--seed-file", help="use the lines of this file as seeds instead of a counter")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--chunk", type=int, default=DEFAULT_CHUNK, help="digests per work item (even)")
+    parser.add_argument("--verify", type=int, nargs="?", const=5000, metavar="BITS",
+                        help="first check BITS bits (default: 5000) of the counter stream "
+                             "against process_block() and stop on a mismatch")
+    args = parser.parse_args(argv)
+
+    if args.verify:
+        if not verify(args.verify, args.prefix.encode("utf-8"), args.start, args.chunk):
+            print("Stream does not match concatenated process_block() digests", file=sys.stderr)
+            return 1
+        print(f"Verified {args.verify} bits against process_block()", file=sys.stderr)
+
+    total_bits = args.bits * args.streams
+    directory = os.path.dirname(args.output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(args.output, "wb") as out:
+        stats = generate(out, total_bits, args.format, args.prefix.encode("utf-8"), args.start,
+                         args.seed_file, args.workers, args.chunk)
+
+    print(f"Wrote {stats['bits']} bits ({stats['digests']} digests) to {args.output} "
+          f"in {stats['seconds']:.2f} s: {stats['bits_per_s'] / 1e6:.3f} Mbit/s, "
+          f"{stats['digests_per_s']:.0f} digests/s", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,6 +6,7 @@ Compares Radix-Hash with SHA-256, SHA-3, and other standard algorithms
 """
 
 import time
+import timeit
 import hashlib
 import psutil
 import os
@@ -24,9 +25,107 @@ except ImportError:
     RADIX_HASH_AVAILABLE = False
     
     # Dummy function for testing
-    def process_block(text: str) -> str:
+    def process_block(text: str, engine=None) -> str:
         return "0" * 772
 
+def verify_engines(samples: int = 50) -> bool:
+    """Cross-check the optimized code paths against the reference implementations"""
+    if not RADIX_HASH_AVAILABLE:
+        return False
+    import random
+    from model import radix_hash
+    from utils import balance_transforms
+
+    rng = random.Random(772)
+    for _ in range(samples):
+        bits = "".join(rng.choice("01") for _ in range(772))
+        if radix_hash.bits_to_base3_int(bits) != radix_hash._bits_to_base3_int_reference(bits):
+            print("Mismatch: table-driven bits_to_base3_int differs from reference loop")
+            return False
+        if balance_transforms.xor_not_reverse_dynamic_count(bits) != \
+                balance_transforms._xor_not_reverse_dynamic_count_reference(bits):
+            print("Mismatch: integer scramble differs from reference string scramble")
+            return False
+        n = radix_hash.bits_to_base3_int(bits)
+        if radix_hash._hash_base3_int(n) != radix_hash._hash_base3_int_reference(n):
+            print("Mismatch: table-driven exponent chain differs from reference chain")
+            return False
+        active = radix_hash.get_backend()
+        try:
+            for backend in radix_hash.BACKENDS:
+                radix_hash.set_backend(backend)
+                if radix_hash._hash_base3_int(n) != radix_hash._hash_base3_int_reference(n):
+                    print(f"Mismatch: exponent chain on the {backend} backend differs from reference")
+                    return False
+        finally:
+            radix_hash.set_backend(active)
+        text = "".join(chr(rng.randrange(32, 0x250)) for _ in range(rng.randrange(0, 300)))
+        if process_block(text, engine="int") != process_block(text, engine="string"):
+            print("Mismatch: integer engine differs from string engine")
+            return False
+        data = text.encode("utf-8")
+        generic = radix_hash.RadixFamily(radix_hash.DEFAULT_PARAMS)
+        if generic.digest_int(data, engine="int") != radix_hash.digest_int(data, engine="int"):
+            print("Mismatch: generic parameter-set path differs from the default 772-bit hash")
+            return False
+        for name in radix_hash.PARAM_SETS:
+            if radix_hash.digest(data, engine="int", params=name) != \
+                    radix_hash.digest(data, engine="string", params=name):
+                print(f"Mismatch: integer engine differs from string engine for {name}")
+                return False
+    return True
+
+def benchmark_block_stages(samples: int = 200) -> Dict[str, float]:
+    """Per-block micro-benchmark of the optimized stages against their reference versions"""
+    import random
+    from model import radix_hash
+
+    rng = random.Random(486)
+    blocks = [radix_hash._scramble_block_int(rng.getrandbits(772)) for _ in range(samples)]
+    bit_strings = [format(block, "0772b") for block in blocks]
+    base3_values = [radix_hash._base3_from_int(block) for block in blocks]
+    radix_hash._base3_from_int(0)  # build lookup tables outside the timed region
+
+    def per_block_us(func, inputs, repeat: int = 5):
+        """Fastest of `repeat` autoranged batches of passes over inputs"""
+        def one_pass():
+            for value in inputs:
+                func(value)
+        timer = timeit.Timer(one_pass)
+        passes, _ = timer.autorange()
+        return min(timer.repeat(repeat, passes)) / passes / len(inputs) * 1e6
+
+    stages = {
+        'base3_reference_us': per_block_us(radix_hash._bits_to_base3_int_reference, bit_strings),
+        'base3_table_us': per_block_us(radix_hash.bits_to_base3_int, bit_strings),
+        'chain_reference_us': per_block_us(radix_hash._hash_base3_int_reference, base3_values),
+        'chain_table_us': per_block_us(radix_hash._hash_base3_int, base3_values),
+    }
+    active = radix_hash.get_backend()
+    try:
+        for backend in radix_hash.BACKENDS:
+            radix_hash.set_backend(backend)
+            stages[f'chain_backend_{backend}_us'] = per_block_us(radix_hash._hash_base3_int, base3_values)
+    finally:
+        radix_hash.set_backend(active)
+    return stages
+
+def format_stage_report(stages: Dict[str, float]) -> str:
+    """Format the per-block micro-benchmark results"""
+    lines = ["PER-BLOCK STAGE MICRO-BENCHMARK", "-" * 80]
+    for stage in ('base3', 'chain'):
+        reference = stages[f'{stage}_reference_us']
+        optimized = stages[f'{stage}_table_us']
+        speedup = reference / optimized if optimized > 0 else 0
+        lines.append(f"{stage:<8} reference: {reference:>9.2f} us/block   "
+                     f"table: {optimized:>9.2f} us/block   speedup: {speedup:.2f}x")
+    backends = [(key[len('chain_backend_'):-len('_us')], value)
+                for key, value in stages.items() if key.startswith('chain_backend_')]
+    if backends:
+        lines.append("chain by big-integer backend: " + "   ".join(
+            f"{name}: {value:.2f} us/block" for name, value in backends))
+    return "\n".join(lines)
+
 class PerformanceBenchmark:
     def __init__(self):
         self.results = {}
@@ -67,33 +166,38 @@ class PerformanceBenchmark:
     
     def measure_time_and_memory(self, func, data: str) -> Dict[str, Any]:
         """Measure execution time and memory usage for a function"""
-        # Memory measurement
-        tracemalloc.start()
-        process = psutil.Process(os.getpid())
-        memory_before = process.memory_info().rss
-        
-        # Time measurement
+        # Warm-up run, then time without tracemalloc so tracing does not
+        # distort the measurement
+        func(data)
         start_time = time.perf_counter()
         result = func(data)
         end_time = time.perf_counter()
         
-        # Memory after
-        memory_after = process.memory_info().rss
+        # Memory measurement in a separate, untimed run
+        process = psutil.Process(os.getpid())
+        memory_before = process.memory_info().rss
+        tracemalloc.start()
+        func(data)
         current, peak = tracemalloc.get_traced_memory()
         tracemalloc.stop()
+        memory_after = process.memory_info().rss
         
         return {
             'result': result,
             'time': end_time - start_time,
             'memory_peak': peak,
             'memory_diff': memory_after - memory_before,
-            'input_size': len(data)
+            'input_size': len(data.encode('utf-8'))
         }
     
     def radix_hash_wrapper(self, text: str) -> str:
         """Wrapper for Radix-Hash"""
         return process_block(text)
     
+    def radix_hash_int_wrapper(self, text: str) -> str:
+        """Wrapper for Radix-Hash using the native integer engine"""
+        return process_block(text, engine="int")
+    
     def sha256_wrapper(self, text: str) -> str:
         """Wrapper for SHA-256"""
         return hashlib.sha256(text.encode('utf-8')).hexdigest()
@@ -141,6 +245,7 @@ class PerformanceBenchmark:
             'max_memory': max(memories),
             'avg_input_size': statistics.mean(input_sizes),
             'throughput_mb_s': statistics.mean([size/time/1024/1024 for size, time in zip(input_sizes, times) if time > 0]),
+            'throughput_bytes_s': statistics.mean([size/time for size, time in zip(input_sizes, times) if time > 0]),
             'samples': len(results)
         }
     
@@ -148,11 +253,21 @@ class PerformanceBenchmark:
         """Run comprehensive benchmark on all algorithms and test categories"""
         algorithms = {
             'Radix-Hash': self.radix_hash_wrapper,
+            'Radix-Hash-int': self.radix_hash_int_wrapper,
             'SHA-256': self.sha256_wrapper,
             'SHA3-256': self.sha3_256_wrapper,
             'SHA3-512': self.sha3_512_wrapper,
             'BLAKE2b': self.blake2b_wrapper
         }
+        # Big-integer backend of each per-backend run; it is selected once
+        # around the whole run because switching rebuilds the power table.
+        backends = {}
+        if RADIX_HASH_AVAILABLE:
+            from model import radix_hash
+            for backend in radix_hash.BACKENDS:
+                name = f'Radix-Hash-int ({backend})'
+                algorithms[name] = self.radix_hash_int_wrapper
+                backends[name] = backend
         
         if not RADIX_HASH_AVAILABLE:
             print("Warning: Running benchmark with dummy Radix-Hash implementation")
@@ -163,11 +278,19 @@ class PerformanceBenchmark:
             results[alg_name] = {}
             print(f"\nTesting {alg_name}...")
             
-            for category in self.test_data.keys():
-                print(f"  - {category} inputs...")
-                category_result = self.run_algorithm_benchmark(alg_name, alg_func, category)
-                if category_result:
-                    results[alg_name][category] = category_result
+            backend = backends.get(alg_name)
+            if backend:
+                active = radix_hash.get_backend()
+                radix_hash.set_backend(backend)
+            try:
+                for category in self.test_data.keys():
+                    print(f"  - {category} inputs...")
+                    category_result = self.run_algorithm_benchmark(alg_name, alg_func, category)
+                    if category_result:
+                        results[alg_name][category] = category_result
+            finally:
+                if backend:
+                    radix_hash.set_backend(active)
         
         return results
     
@@ -188,16 +311,16 @@ class PerformanceBenchmark:
         # Performance comparison table
         report.append("PERFORMANCE COMPARISON (Average Values)")
         report.append("-" * 80)
-        report.append(f"{'Algorithm':<15} {'Category':<10} {'Time (ms)':<12} {'Memory (KB)':<12} {'Throughput (MB/s)':<15}")
+        report.append(f"{'Algorithm':<24} {'Category':<10} {'Time (ms)':<12} {'Memory (KB)':<12} {'Throughput':<15}")
         report.append("-" * 80)
         
         for alg_name in results:
             for category in results[alg_name]:
                 data = results[alg_name][category]
-                report.append(f"{alg_name:<15} {category:<10} "
+                report.append(f"{alg_name:<24} {category:<10} "
                             f"{data['avg_time']*1000:<12.3f} "
                             f"{data['avg_memory']/1024:<12.1f} "
-                            f"{data.get('throughput_mb_s', 0):<15.2f}")
+                            f"{format_rate(data.get('throughput_bytes_s', 0)):<15}")
         
         report.append("")
         
@@ -215,7 +338,7 @@ class PerformanceBenchmark:
                 report.append(f"  Median time: {data['median_time']*1000:.3f} ms")
                 report.append(f"  Average memory: {data['avg_memory']/1024:.1f} KB")
                 report.append(f"  Max memory: {data['max_memory']/1024:.1f} KB")
-                report.append(f"  Throughput: {data.get('throughput_mb_s', 0):.2f} MB/s")
+                report.append(f"  Throughput: {format_rate(data.get('throughput_bytes_s', 0))}")
                 report.append(f"  Samples: {data['samples']}")
         
         # Relative performance analysis
@@ -263,11 +386,306 @@ class PerformanceBenchmark:
         print(f"- {filename_prefix}_results.json")
         print(f"- {filename_prefix}_report.txt")
 
+def format_rate(bytes_per_s: float) -> str:
+    """Human readable throughput"""
+    for unit, scale in (('GB/s', 1024 ** 3), ('MB/s', 1024 ** 2), ('KB/s', 1024)):
+        if bytes_per_s >= scale:
+            return f"{bytes_per_s / scale:.2f} {unit}"
+    return f"{bytes_per_s:.1f} B/s"
+
+def parse_size(text: str) -> int:
+    """Parse sizes like 1, 512, 4K, 64M, 1G"""
+    text = text.strip().upper().rstrip('B')
+    multipliers = {'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+    if text and text[-1] in multipliers:
+        return int(float(text[:-1]) * multipliers[text[-1]])
+    return int(text)
+
+def log_sizes(min_size: int, max_size: int, factor: int = 4) -> List[int]:
+    """Input sizes from min_size to max_size on a log scale"""
+    sizes = []
+    size = max(1, min_size)
+    while size < max_size:
+        sizes.append(size)
+        size *= factor
+    sizes.append(max_size)
+    return sizes
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    """Linearly interpolated percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * p / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+class BenchmarkSuite:
+    """
+    Size sweep with warm-up and repeated timed runs (no tracemalloc while
+    timing), latency percentiles and bytes/s, plus the per-block stage
+    micro-benchmarks.
+    """
+    
+    def __init__(self, sizes: List[int], warmup: int = 1, repeat: int = 5,
+                 budget: float = 10.0, algorithms: List[str] = None, seed: int = 772):
+        self.sizes = sizes
+        self.warmup = warmup
+        self.repeat = max(1, repeat)
+        self.budget = budget
+        self.seed = seed
+        available = self.available_algorithms()
+        self.algorithms = {name: available[name] for name in (algorithms or available)}
+    
+    @staticmethod
+    def available_algorithms() -> Dict[str, Any]:
+        algorithms = {
+            'SHA-256': lambda data: hashlib.sha256(data).digest(),
+            'BLAKE2b': lambda data: hashlib.blake2b(data).digest(),
+        }
+        if RADIX_HASH_AVAILABLE:
+            from model import radix_hash
+            algorithms['Radix-Hash-int'] = lambda data: radix_hash.digest(data, engine="int")
+            algorithms['Radix-Hash-string'] = lambda data: radix_hash.digest(data, engine="string")
+            for name, params in radix_hash.PARAM_SETS.items():
+                if params != radix_hash.DEFAULT_PARAMS:
+                    algorithms[f'Radix-Hash-int [{name}]'] = (
+                        lambda data, params=params: radix_hash.digest(data, engine="int", params=params))
+        return algorithms
+    
+    @staticmethod
+    def parameter_sets() -> Dict[str, List[int]]:
+        """Parameter set (block bits, modulus exponent, output bits) of each Radix-Hash algorithm"""
+        if not RADIX_HASH_AVAILABLE:
+            return {}
+        from model import radix_hash
+        params = {'Radix-Hash-int': list(radix_hash.DEFAULT_PARAMS),
+                  'Radix-Hash-string': list(radix_hash.DEFAULT_PARAMS)}
+        for name, value in radix_hash.PARAM_SETS.items():
+            if value != radix_hash.DEFAULT_PARAMS:
+                params[f'Radix-Hash-int [{name}]'] = list(value)
+        return params
+    
+    def time_runs(self, func, data) -> Dict[str, Any]:
+        """
+        Warm up, then time batches of calls until `repeat` batches or the
+        time budget is reached. timeit's autorange sizes the batches (at
+        least 0.2 s each), so short calls are not lost in timer resolution;
+        every sample is a batch time divided by its number of calls.
+        """
+        for _ in range(self.warmup):
+            func(data)
+        timer = timeit.Timer(lambda: func(data))
+        loops, spent = timer.autorange()
+        times = [spent / loops]
+        while len(times) < self.repeat and spent < self.budget:
+            elapsed = timer.timeit(loops)
+            times.append(elapsed / loops)
+            spent += elapsed
+        times.sort()
+        p50 = percentile(times, 50)
+        return {
+            'runs': len(times),
+            'loops': loops,
+            'min_s': times[0],
+            'mean_s': statistics.mean(times),
+            'p50_s': p50,
+            'p90_s': percentile(times, 90),
+            'p99_s': percentile(times, 99),
+            'max_s': times[-1],
+            'bytes_per_s': len(data) / p50 if p50 > 0 else 0.0,
+        }
+    
+    def run(self) -> Dict[str, Any]:
+        import random
+        
+        data = memoryview(random.Random(self.seed).randbytes(max(self.sizes)))
+        results = {}
+        for name, func in self.algorithms.items():
+            print(f"\nSweeping {name}...")
+            last = None
+            for size in self.sizes:
+                key = f"{name}/{size}"
+                # Skip sizes whose single run would already blow the budget
+                if last is not None and last[1] * size / last[0] > self.budget:
+                    print(f"  {size:>10} B  skipped (estimated over {self.budget:.0f} s budget)")
+                    results[key] = {'algorithm': name, 'size': size, 'skipped': True}
+                    continue
+                measurement = self.time_runs(func, data[:size])
+                measurement.update({'algorithm': name, 'size': size})
+                results[key] = measurement
+                last = (size, measurement['p50_s'])
+                print(f"  {size:>10} B  p50 {measurement['p50_s'] * 1000:>10.3f} ms  "
+                      f"{format_rate(measurement['bytes_per_s']):>12}  ({measurement['runs']} runs)")
+        
+        stages = benchmark_block_stages() if RADIX_HASH_AVAILABLE else {}
+        return {
+            'suite': 1,
+            'python': sys.version.split()[0],
+            'cpu_count': psutil.cpu_count(),
+            'warmup': self.warmup,
+            'repeat': self.repeat,
+            'results': results,
+            'params': {name: value for name, value in self.parameter_sets().items()
+                       if name in self.algorithms},
+            'stages': stages,
+        }
+    
+    @staticmethod
+    def format_report(run: Dict[str, Any]) -> str:
+        lines = ["=" * 80, "RADIX-HASH BENCHMARK SUITE", "=" * 80,
+                 f"Python {run['python']}, {run['cpu_count']} CPUs, "
+                 f"{run['warmup']} warm-up + up to {run['repeat']} timed batches per size", ""]
+        lines.append(f"{'Algorithm':<28} {'Size (B)':>10} {'p50 (ms)':>12} {'p90 (ms)':>12} "
+                     f"{'p99 (ms)':>12} {'Throughput':>14}")
+        lines.append("-" * 92)
+        for entry in run['results'].values():
+            if entry.get('skipped'):
+                lines.append(f"{entry['algorithm']:<28} {entry['size']:>10} {'skipped':>12}")
+                continue
+            lines.append(f"{entry['algorithm']:<28} {entry['size']:>10} "
+                         f"{entry['p50_s'] * 1000:>12.3f} {entry['p90_s'] * 1000:>12.3f} "
+                         f"{entry['p99_s'] * 1000:>12.3f} {format_rate(entry['bytes_per_s']):>14}")
+        if run.get('params'):
+            lines.append("")
+            lines.append("Throughput per parameter set (largest measured size):")
+            for name, (block_bits, exponent, output_bits) in run['params'].items():
+                measured = [e for e in run['results'].values()
+                            if e['algorithm'] == name and not e.get('skipped')]
+                if measured:
+                    best = max(measured, key=lambda e: e['size'])
+                    lines.append(f"  {name:<28} block {block_bits:>4} bits, M = 3**{exponent:<4} "
+                                 f"output {output_bits:>4} bits  {format_rate(best['bytes_per_s']):>14}")
+        if run.get('stages'):
+            lines.append("")
+            lines.append(format_stage_report(run['stages']))
+        return "\n".join(lines)
+
+def flatten_timings(results: Dict[str, Any]) -> Dict[str, float]:
+    """
+    Gated timings (lower is better) keyed by name. Only Radix-Hash metrics
+    are included: the standard hashes and the reference stage versions do
+    not change with this code. Suite runs contribute the fastest batch of
+    each size; the legacy per-category results file its median times.
+    """
+    flat = {}
+    if results.get('suite'):
+        for key, entry in results.get('results', {}).items():
+            if entry['algorithm'].startswith('Radix-Hash') and not entry.get('skipped'):
+                flat[key] = entry['min_s']
+        for key, value in results.get('stages', {}).items():
+            if '_reference_' not in key:
+                flat[f"stage/{key}"] = value
+        return flat
+    for alg_name, categories in results.items():
+        if alg_name.startswith('Radix-Hash') and isinstance(categories, dict):
+            for category, data in categories.items():
+                if isinstance(data, dict) and 'median_time' in data:
+                    flat[f"{alg_name}/{category}"] = data['median_time']
+    return flat
+
+def compare_to_baseline(current: Dict[str, Any], baseline: Dict[str, Any],
+                        threshold: float) -> List[str]:
+    """Return one line per metric that got slower than the baseline by more than threshold %"""
+    new, old = flatten_timings(current), flatten_timings(baseline)
+    regressions = []
+    for key in sorted(new.keys() & old.keys()):
+        if old[key] > 0 and new[key] > old[key] * (1 + threshold / 100):
+            change = (new[key] / old[key] - 1) * 100
+            regressions.append(f"{key}: {old[key]:.6g} -> {new[key]:.6g} (+{change:.1f}%)")
+    return regressions
+
+def check_baseline(current: Dict[str, Any], baseline_path: str, threshold: float) -> int:
+    """Compare against a stored baseline JSON; returns the process exit code"""
+    import json
+    
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    if bool(current.get('suite')) != bool(baseline.get('suite')):
+        layouts = ('a --suite results file', 'a category comparison results file')
+        print(f"\nIncompatible baseline: {baseline_path} is {layouts[not baseline.get('suite')]}, "
+              f"but this run is {layouts[not current.get('suite')]}; nothing to compare.")
+        return 1
+    new, old = flatten_timings(current), flatten_timings(baseline)
+    compared = len(new.keys() & old.keys())
+    missing = sorted(old.keys() - new.keys())
+    regressions = compare_to_baseline(current, baseline, threshold)
+    print(f"\nBaseline comparison against {baseline_path} "
+          f"({compared} metrics, threshold {threshold:.1f}%):")
+    if not compared:
+        print("  ERROR no metrics in common with the baseline, nothing was compared")
+        return 1
+    for key in missing:
+        print(f"  MISSING {key}: in the baseline but not in this run")
+    for line in regressions:
+        print(f"  REGRESSION {line}")
+    if not regressions and not missing:
+        print("  no regressions")
+        return 0
+    return 1
+
+def run_suite(args) -> int:
+    """Run the size-sweep suite from parsed command-line arguments"""
+    import json
+    
+    if RADIX_HASH_AVAILABLE and not verify_engines():
+        print("Engine verification failed, aborting benchmark.")
+        return 1
+    sizes = log_sizes(parse_size(args.min_size), parse_size(args.max_size), args.factor)
+    algorithms = args.algorithms.split(',') if args.algorithms else None
+    unknown = set(algorithms or ()) - set(BenchmarkSuite.available_algorithms())
+    if unknown:
+        print(f"Unknown algorithm(s): {', '.join(sorted(unknown))}")
+        return 2
+    suite = BenchmarkSuite(sizes, args.warmup, args.repeat, args.budget, algorithms)
+    run = suite.run()
+    print()
+    print(BenchmarkSuite.format_report(run))
+    
+    with open(args.output, 'w') as f:
+        json.dump(run, f, indent=2)
+    print(f"\nResults saved: {args.output}")
+    
+    if args.baseline:
+        return check_baseline(run, args.baseline, args.threshold)
+    return 0
+
 def main():
     """Main benchmark execution"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Radix-Hash performance benchmarks")
+    parser.add_argument('--suite', action='store_true',
+                        help="run the size-sweep suite instead of the category comparison")
+    parser.add_argument('--min-size', default='1', help="smallest input size (default: 1)")
+    parser.add_argument('--max-size', default='64M', help="largest input size (default: 64M)")
+    parser.add_argument('--factor', type=int, default=4, help="size step factor (default: 4)")
+    parser.add_argument('--warmup', type=int, default=1, help="warm-up runs per size")
+    parser.add_argument('--repeat', type=int, default=5, help="timed runs per size")
+    parser.add_argument('--budget', type=float, default=10.0,
+                        help="seconds of timed runs per size; larger sizes that would exceed it are skipped")
+    parser.add_argument('--algorithms', help="comma separated subset of the suite algorithms")
+    parser.add_argument('--output', default='radix_hash_suite_results.json',
+                        help="where the suite writes its JSON results")
+    parser.add_argument('--baseline', help="baseline JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help="allowed slowdown in percent before failing (default: 10)")
+    args = parser.parse_args()
+    
+    if args.suite:
+        sys.exit(run_suite(args))
+    
     print("Starting Radix-Hash Performance Benchmark...")
     print("This may take several minutes to complete.\n")
     
+    if RADIX_HASH_AVAILABLE and not verify_engines():
+        print("Engine verification failed, aborting benchmark.")
+        sys.exit(1)
+    
+    if RADIX_HASH_AVAILABLE:
+        print(format_stage_report(benchmark_block_stages()))
+        print()
+    
     benchmark = PerformanceBenchmark()
     results = benchmark.run_full_benchmark()
     
@@ -279,7 +697,10 @@ def main():
     # Save results
     benchmark.save_results(results, report)
     
+    if args.baseline:
+        sys.exit(check_baseline(results, args.baseline, args.threshold))
+    
     print("\nBenchmark completed!")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
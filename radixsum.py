@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+radixsum - print or check Radix-Hash (772-bit) checksums, like sha256sum.
+
+    python radixsum.py FILE...            print "<hex digest>  <file>" lines
+    python radixsum.py -j 8 FILE...       hash several files in parallel
+    python radixsum.py -c SUMS            verify the files listed in SUMS
+    cat FILE | python radixsum.py         hash stdin ("-" also means stdin)
+
+Files are hashed as raw bytes. Regular files are memory-mapped and fed to
+the hasher in block-aligned windows, so large files are never read whole.
+"""
+import argparse
+import mmap
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from model.radix_hash import ENGINES, PAIR_BYTES, RadixHash
+
+# Window size for mmap reads: a multiple of 193 bytes (two 772-bit blocks),
+# so every window ends on a block boundary. About 1 MiB.
+WINDOW_BYTES = PAIR_BYTES * 5433
+
+def hash_stream(stream, engine: str) -> str:
+    """Hash a binary stream read in block-aligned chunks."""
+    h = RadixHash(engine=engine)
+    for piece in iter(lambda: stream.read(WINDOW_BYTES), b""):
+        h.update(piece)
+    return h.hexdigest()
+
+def hash_file(path: str, engine: str) -> str:
+    """Hash a file by memory-mapping it; "-" reads stdin."""
+    if path == "-":
+        return hash_stream(sys.stdin.buffer, engine)
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            # Empty files (and special files reporting size 0) cannot be mapped.
+            return hash_stream(f, engine)
+        h = RadixHash(engine=engine)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            view = memoryview(mm)
+            try:
+                for off in range(0, size, WINDOW_BYTES):
+                    h.update(view[off:off + WINDOW_BYTES])
+            finally:
+                view.release()
+        return h.hexdigest()
+
+def _hash_file_job(args):
+    """Worker entry point: (path, engine) -> (hex digest, error message)."""
+    path, engine = args
+    try:
+        return hash_file(path, engine), None
+    except OSError as e:
+        return None, f"{path}: {e.strerror or e}"
+
+def hash_files(paths, engine: str, jobs: int):
+    """Yield (path, hex digest, error) in input order, using a pool if jobs > 1."""
+    work = [(path, engine) for path in paths]
+    # stdin cannot be shared with worker processes.
+    if jobs > 1 and len(paths) > 1 and "-" not in paths:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            for path, (hexdigest, error) in zip(paths, pool.map(_hash_file_job, work)):
+                yield path, hexdigest, error
+    else:
+        for path, job in zip(paths, work):
+            hexdigest, error = _hash_file_job(job)
+            yield path, hexdigest, error
+
+def parse_manifest_line(line: str):
+    """Split a "<hex>  <path>" (or "<hex> *<path>") line; None if malformed."""
+    line = line.rstrip("\r\n")
+    digest, sep, path = line.partition(" ")
+    if not sep or not path or not digest:
+        return None
+    if path[0] in " *":
+        path = path[1:]
+    try:
+        bytes.fromhex(digest)
+    except ValueError:
+        return None
+    return digest.lower(), path
+
+def check_manifests(manifests, engine: str, jobs: int, quiet: bool, status: bool) -> int:
+    """Verify every file listed in the manifests; return the exit code."""
+    entries = []
+    malformed = 0
+    for manifest in manifests:
+        stream = sys.stdin if manifest == "-" else open(manifest, "r", encoding="utf-8")
+        with stream:
+            for line in stream:
+                if not line.strip():
+                    continue
+                entry = parse_manifest_line(line)
+                if entry is None:
+                    malformed += 1
+                else:
+                    entries.append(entry)
+
+    failed = unreadable = 0
+    expected = [digest for digest, _ in entries]
+    paths = [path for _, path in entries]
+    for want, (path, got, error) in zip(expected, hash_files(paths, engine, jobs)):
+        if error is not None:
+            unreadable += 1
+            if not status:
+                print(f"radixsum: {error}", file=sys.stderr)
+                print(f"{path}: FAILED open or read")
+        elif got != want:
+            failed += 1
+            if not status:
+                print(f"{path}: FAILED")
+        elif not quiet and not status:
+            print(f"{path}: OK")
+
+    if not status:
+        if malformed:
+            print(f"radixsum: WARNING: {malformed} line(s) improperly formatted", file=sys.stderr)
+        if unreadable:
+            print(f"radixsum: WARNING: {unreadable} listed file(s) could not be read", file=sys.stderr)
+        if failed:
+            print(f"radixsum: WARNING: {failed} computed checksum(s) did NOT match", file=sys.stderr)
+    return 1 if failed or unreadable or (malformed and not entries) else 0
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="radixsum", description="Print or check Radix-Hash (772-bit) checksums.")
+    parser.add_argument("files", nargs="*", default=["-"],
+                        help='files to hash; "-" or nothing reads stdin')
+    parser.add_argument("-c", "--check", action="store_true",
+                        help="read checksums from the FILEs and check them")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="number of files hashed in parallel (default: 1)")
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="int",
+                        help="block engine (default: int)")
+    parser.add_argument("--quiet", action="store_true",
+                        help="with --check, don't print OK for each verified file")
+    parser.add_argument("--status", action="store_true",
+                        help="with --check, print nothing; the exit code shows success")
+    args = parser.parse_args(argv)
+    jobs = max(1, args.jobs)
+
+    if args.check:
+        try:
+            return check_manifests(args.files, args.engine, jobs, args.quiet, args.status)
+        except OSError as e:
+            print(f"radixsum: {e}", file=sys.stderr)
+            return 1
+
+    exit_code = 0
+    for path, hexdigest, error in hash_files(args.files, args.engine, jobs):
+        if error is not None:
+            print(f"radixsum: {error}", file=sys.stderr)
+            exit_code = 1
+        else:
+            print(f"{hexdigest}  {path}")
+    return exit_code
+
+if __name__ == "__main__":
+    sys.exit(main())
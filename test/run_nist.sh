@@ -0,0 +1,31 @@
+#!/usr/bin/env bash
+# Generate a Radix-Hash bit stream for the NIST Statistical Test Suite and,
+# if the STS "assess" tool is available, run all tests on it.
+#
+#   test/run_nist.sh [BITS_PER_STREAM] [STREAMS]
+#
+# Environment:
+#   NIST_STS_DIR   directory containing the compiled "assess" binary (optional)
+#   WORKERS        worker processes for the generator (default: all CPUs)
+set -euo pipefail
+
+BITS="${1:-1000000}"
+STREAMS="${2:-100}"
+ROOT="$(cd "$(dirname "$0")/.." && pwd)"
+OUTPUT="$ROOT/results/nist_test_data.txt"
+
+cd "$ROOT"
+python3 nist_generator.py --bits "$BITS" --streams "$STREAMS" --format ascii \
+    --output "$OUTPUT" --verify ${WORKERS:+--workers "$WORKERS"}
+
+if [ -z "${NIST_STS_DIR:-}" ] || [ ! -x "$NIST_STS_DIR/assess" ]; then
+    echo "Bit stream written to $OUTPUT"
+    echo "Set NIST_STS_DIR to the STS directory to run the tests automatically."
+    exit 0
+fi
+
+# assess prompts: generator (0 = input file), file name, apply all tests (1),
+# parameter adjustments (0 = none), number of bitstreams, input format (0 = ASCII).
+cd "$NIST_STS_DIR"
+printf '0\n%s\n1\n0\n%s\n0\n' "$OUTPUT" "$STREAMS" | ./assess "$BITS"
+echo "Results: $NIST_STS_DIR/experiments/AlgorithmTesting/finalAnalysisReport.txt"
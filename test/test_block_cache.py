@@ -0,0 +1,37 @@
+import pytest
+
+from model.block_cache import BlockCache
+from model.radix_hash import DEFAULT_PARAMS, PARAM_SETS, RadixHash, digest, family
+
+DATA = b"abc" * 500 + bytes(2000)
+
+def test_cached_digests_match():
+    cache = BlockCache()
+    assert digest(DATA, cache=cache) == digest(DATA)
+    assert digest(DATA, cache=cache) == digest(DATA)
+    assert RadixHash(DATA, cache=cache).digest() == digest(DATA)
+    assert cache.hits > 0
+    assert cache.params == tuple(DEFAULT_PARAMS)
+
+def test_cache_shared_between_parameter_sets_is_rejected():
+    cache = BlockCache()
+    digest(DATA, cache=cache, params="radix-388")
+    with pytest.raises(ValueError, match="parameter set"):
+        digest(DATA, cache=cache, params="radix-260")
+    assert cache.params == tuple(PARAM_SETS["radix-388"])
+
+def test_cache_shared_between_family_and_default_is_rejected():
+    cache = BlockCache()
+    family("radix-260").digest(DATA, cache=cache)
+    with pytest.raises(ValueError, match="parameter set"):
+        digest(DATA, cache=cache)
+    with pytest.raises(ValueError, match="parameter set"):
+        RadixHash(cache=cache)
+
+def test_prebound_cache_and_clear():
+    cache = BlockCache(params=DEFAULT_PARAMS)
+    with pytest.raises(ValueError):
+        RadixHash(cache=cache, params="radix-388")
+    cache.clear()
+    h = RadixHash(DATA, cache=cache, params="radix-388")
+    assert h.digest() == digest(DATA, params="radix-388")
@@ -0,0 +1,24 @@
+import pytest
+
+from model.bloom import BLOOM_MAGIC, _HEADER, BloomFilter
+
+def test_no_false_negatives_and_expected_false_positive_rate():
+    bf = BloomFilter.for_capacity(2000, 0.01)
+    bf.add_many(b"in:%d" % i for i in range(2000))
+    assert all(bf.contains_many([b"in:%d" % i for i in range(2000)]))
+    false_positives = sum(bf.contains_many([b"out:%d" % i for i in range(4000)]))
+    assert false_positives < 4000 * 0.03
+
+def test_file_round_trip(tmp_path):
+    path = str(tmp_path / "filter.rxb")
+    with BloomFilter(1 << 16, 5, path=path) as bf:
+        bf.add(b"hello")
+    with BloomFilter.open(path) as bf:
+        assert b"hello" in bf
+        assert len(bf) == 1
+
+def test_old_index_layout_is_rejected(tmp_path):
+    path = tmp_path / "old.rxb"
+    path.write_bytes(_HEADER.pack(BLOOM_MAGIC, 1, 64, 3, 0) + bytes(8))
+    with pytest.raises(ValueError, match="rebuild"):
+        BloomFilter.open(str(path))
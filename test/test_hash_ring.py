@@ -0,0 +1,33 @@
+from collections import Counter
+
+from model.bloom import derive_indexes
+from model.hash_ring import HashRing, RING_BITS
+from model.radix_hash import digest_int
+
+KEYS = [b"key:%d" % i for i in range(8000)]
+
+def test_index_words_are_balanced():
+    top = Counter(derive_indexes(digest_int(k, engine="int"), 1, RING_BITS)[0] >> (RING_BITS - 1)
+                  for k in KEYS)
+    assert abs(top[0] - top[1]) < 0.05 * len(KEYS)
+
+def test_ring_points_cover_the_whole_ring():
+    ring = HashRing(["shard-%d" % i for i in range(8)], replicas=256)
+    quarters = Counter(point >> (RING_BITS - 2) for point in ring._points)
+    expected = len(ring._points) / 4
+    assert all(abs(quarters[q] - expected) < 0.15 * expected for q in range(4))
+
+def test_shard_load_balance():
+    ring = HashRing(["shard-%d" % i for i in range(8)], replicas=256)
+    loads = Counter(ring.get_node(k) for k in KEYS)
+    ideal = len(KEYS) / 8
+    assert len(loads) == 8
+    assert all(abs(load - ideal) < 0.2 * ideal for load in loads.values()), sorted(loads.values())
+
+def test_routing_is_stable_when_a_node_is_added():
+    ring = HashRing(["shard-%d" % i for i in range(8)], replicas=64)
+    before = {k: ring.get_node(k) for k in KEYS[:2000]}
+    ring.add_node("shard-8")
+    moved = [k for k in before if ring.get_node(k) != before[k]]
+    assert all(ring.get_node(k) == "shard-8" for k in moved)
+    assert len(moved) < 0.25 * len(before)
@@ -0,0 +1,49 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from controller.hash_service import HashClient, HashService, ServiceError
+from model.radix_hash import PAIR_BYTES, digest
+
+def _run(coro):
+    return asyncio.run(coro)
+
+async def _with_service(body, **kwargs):
+    service = HashService(executor=ThreadPoolExecutor(2), **kwargs)
+    host, port = await service.start()
+    client = await HashClient.connect(host, port)
+    try:
+        return await body(client, service)
+    finally:
+        await client.close()
+        await service.close()
+
+def test_small_and_multi_block_payloads():
+    messages = [os.urandom(n) for n in (0, 5, 96, 97, 500)]
+
+    async def body(client, service):
+        return [await client.hash(m) for m in messages]
+
+    assert _run(_with_service(body)) == [digest(m) for m in messages]
+
+def test_oversized_payload_is_rejected_and_connection_stays_usable():
+    async def body(client, service):
+        try:
+            await client.hash(bytes(5000))
+        except ServiceError as e:
+            error = str(e)
+        return error, await client.hash(b"abc")
+
+    error, value = _run(_with_service(body, small_limit=4096))
+    assert "4096" in error
+    assert value == digest(b"abc")
+
+def test_stream_frames_larger_than_chunk_size():
+    data = os.urandom(50 * PAIR_BYTES + 17)
+
+    async def body(client, service):
+        # One frame much larger than chunk_size, then a few small ones.
+        return await client.hash_stream([data[:40 * PAIR_BYTES], data[40 * PAIR_BYTES:]])
+
+    value = _run(_with_service(body, chunk_size=4 * PAIR_BYTES, max_chunks_in_flight=2))
+    assert value == digest(data)
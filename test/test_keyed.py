@@ -0,0 +1,52 @@
+import random
+
+import pytest
+
+from model import keyed
+from model.radix_hash import PAIR_BYTES, digest
+
+KEY = b"radix secret"
+_rng = random.Random(23)
+A, B, P = (_rng.randbytes(PAIR_BYTES) for _ in range(3))
+
+def test_plain_digest_is_order_free():
+    # What the forgeries below exploit if the key does not bind positions.
+    assert digest(A + B) == digest(B + A)
+    assert digest(A + P + P) == digest(A)
+
+@pytest.mark.parametrize("forged", [
+    B + A,              # blocks swapped
+    A + P + P + B,      # duplicate pair inserted
+    A + B + P + P,      # duplicate pair appended
+    A + B + bytes(1),   # zero byte appended (same padded blocks)
+])
+def test_forgeries_fail_verify(forged):
+    tag = keyed.keyed_digest(KEY, A + B)
+    assert keyed.verify(KEY, A + B, tag)
+    assert not keyed.verify(KEY, forged, tag)
+
+def test_streaming_checkpoint_and_batch_agree():
+    message = _rng.randbytes(5 * PAIR_BYTES + 50)
+    tag = keyed.keyed_digest(KEY, message)
+    assert keyed.keyed_digest(KEY, message, engine="string") == tag
+
+    h = keyed.new(KEY)
+    for i in range(0, len(message), 37):
+        h.update(message[i:i + 37])
+    assert h.digest() == tag
+
+    partial = keyed.new(KEY, message[:3 * PAIR_BYTES + 11])
+    assert partial.copy().digest() == partial.digest()
+    resumed = keyed.KeyedRadixHash.from_checkpoint(KEY, partial.checkpoint())
+    resumed.update(message[3 * PAIR_BYTES + 11:])
+    assert resumed.digest() == tag
+
+    messages = [b"", b"x", A, message]
+    assert keyed.keyed_digest_many(KEY, messages) == [keyed.keyed_digest(KEY, m) for m in messages]
+
+def test_checkpoint_holds_no_key_state():
+    h = keyed.new(KEY)
+    assert h.checkpoint() == keyed.new(b"another key").checkpoint()
+
+def test_key_matters():
+    assert keyed.keyed_digest(KEY, A) != keyed.keyed_digest(KEY + b"!", A)
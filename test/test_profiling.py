@@ -0,0 +1,25 @@
+import pytest
+
+from model import radix_hash
+
+# The int engine has no separate normalize step.
+ENGINE_STAGES = {
+    "string": radix_hash.STAGES,
+    "int": tuple(s for s in radix_hash.STAGES if s != "normalize"),
+}
+
+@pytest.mark.parametrize("engine", sorted(ENGINE_STAGES))
+def test_stage_calls_match_block_count(engine):
+    data = bytes(range(256)) * 4  # 1024 bytes, 11 blocks
+    radix_hash.enable_profiling()
+    try:
+        value = radix_hash.digest_int(data, engine=engine)
+        stats = radix_hash.get_stats()
+    finally:
+        radix_hash.disable_profiling()
+
+    assert value == radix_hash.digest_int(data, engine=engine)
+    assert stats["blocks"] == 11
+    for stage in radix_hash.STAGES:
+        expected = 11 if stage in ENGINE_STAGES[engine] else 0
+        assert stats["stages"][stage]["calls"] == expected, stage
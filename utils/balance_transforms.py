@@ -1,4 +1,6 @@
-def half_xor_then_append_not(bits: str) -> str:
+import functools
+
+def _half_xor_then_append_not_reference(bits: str) -> str:
     """
     Bits length must be even (772 here). Operation:
     - Split bits into two halves: A | B
@@ -21,7 +23,7 @@ def half_xor_then_append_not(bits: str) -> str:
 
     return C + notC
 
-def interleave_with_not(bits):
+def _interleave_with_not_reference(bits):
     """
     bits: string or list of '0' and '1'
     returns: string ('0'/'1')
@@ -33,7 +35,7 @@ def interleave_with_not(bits):
         interleaved.append(str(1 - bi))
     return "".join(interleaved)
 
-def xor_not_reverse_dynamic_count(bits):
+def _xor_not_reverse_dynamic_count_reference(bits):
     if not isinstance(bits, str):
         bits = "".join(bits)
 
@@ -71,6 +73,125 @@ def xor_not_reverse_dynamic_count(bits):
 
     return "".join(out)
 
+# ---------------------------------------------------------------------------
+# Integer versions
+#
+# A bit string of length nbits is held as an int whose most significant bit
+# is the first character. XOR/NOT/reverse are whole-word operations and run
+# boundaries are found with x ^ (x >> 1) plus bit scanning. Outputs are
+# bit-identical to the reference string functions above.
+# ---------------------------------------------------------------------------
+
+# Bit-reversal table for a single byte.
+_REV8 = bytes(int(f"{i:08b}"[::-1], 2) for i in range(256))
+
+def reverse_bits_int(x: int, nbits: int) -> int:
+    """Reverse the order of the lowest nbits bits of x."""
+    nbytes = (nbits + 7) // 8
+    shifted = x << (8 * nbytes - nbits)
+    return int.from_bytes(shifted.to_bytes(nbytes, "little").translate(_REV8), "big")
+
+@functools.lru_cache(maxsize=None)
+def _spread_masks(width: int) -> tuple:
+    """Masks for spreading a width-bit value (width a power of two) onto even bits."""
+    masks = []
+    s = width // 2
+    while s:
+        # s ones followed by s zeros, repeated over 2 * width bits
+        masks.append((s, ((1 << s) - 1) * (((1 << (2 * width)) - 1) // ((1 << (2 * s)) - 1))))
+        s //= 2
+    return tuple(masks)
+
+def _spread_bits(x: int, nbits: int) -> int:
+    """Move bit k of x to bit 2k (nbits-bit input)."""
+    width = 1 << max(nbits - 1, 0).bit_length()
+    for shift, mask in _spread_masks(width):
+        x = (x | (x << shift)) & mask
+    return x
+
+def half_xor_then_append_not_int(value: int, nbits: int) -> int:
+    """Integer version of half_xor_then_append_not (nbits must be even)."""
+    if nbits % 2 != 0:
+        raise ValueError("half_xor_then_append_not requires even-length bit strings")
+    half = nbits // 2
+    mask = (1 << half) - 1
+    c = (value >> half) ^ (value & mask)
+    return (c << half) | (~c & mask)
+
+def interleave_with_not_int(value: int, nbits: int) -> int:
+    """Integer version of interleave_with_not: every bit b becomes b, NOT b."""
+    mask = (1 << nbits) - 1
+    return (_spread_bits(value & mask, nbits) << 1) | _spread_bits(~value & mask, nbits)
+
+def xor_not_reverse_dynamic_count_int(value: int, nbits: int) -> int:
+    """
+    Integer version of xor_not_reverse_dynamic_count; returns 2 * (nbits // 2) bits.
+    X = A XOR B, R = reverse(NOT X); each run of equal bits in X is followed
+    by the same number of bits of R.
+    """
+    mid = nbits // 2
+    if mid == 0:
+        return 0
+    mask = (1 << mid) - 1
+    # With an odd length the last bit of B has no partner in A and is dropped.
+    x = (value >> (nbits - mid)) ^ ((value >> (nbits - 2 * mid)) & mask)
+    r = reverse_bits_int(~x & mask, mid)
+
+    # Bit q of `edges` is set when bits q+1 and q of X differ (a run ends).
+    edges = (x ^ (x >> 1)) & (mask >> 1)
+    out = 0
+    hi = mid
+    while edges:
+        q = edges.bit_length() - 1
+        lo = q + 1
+        c = hi - lo
+        m = (1 << c) - 1
+        out = (out << (2 * c)) | (((x >> lo) & m) << c) | ((r >> lo) & m)
+        edges ^= 1 << q
+        hi = lo
+    m = (1 << hi) - 1
+    return (out << (2 * hi)) | ((x & m) << hi) | (r & m)
+
+# ---------------------------------------------------------------------------
+# String interface, backed by the integer versions
+# ---------------------------------------------------------------------------
+
+def _to_bit_string(bits) -> str:
+    return bits if isinstance(bits, str) else "".join(str(b) for b in bits)
+
+def half_xor_then_append_not(bits: str) -> str:
+    """
+    Bits length must be even (772 here). Operation:
+    - Split bits into two halves: A | B
+    - C = A XOR B  (length = len(A))
+    - output = C || NOT(C)  (length = 2 * len(C) = len(bits))
+    Ensures exact 50/50 0/1 balance per block.
+    """
+    n = len(bits)
+    if n % 2 != 0:
+        raise ValueError("half_xor_then_append_not requires even-length bit strings")
+    if n == 0:
+        return ""
+    return format(half_xor_then_append_not_int(int(bits, 2), n), f"0{n}b")
+
+def interleave_with_not(bits):
+    """
+    bits: string or list of '0' and '1'
+    returns: string ('0'/'1')
+    """
+    bits = _to_bit_string(bits)
+    n = len(bits)
+    if n == 0:
+        return ""
+    return format(interleave_with_not_int(int(bits, 2), n), f"0{2 * n}b")
+
+def xor_not_reverse_dynamic_count(bits):
+    bits = _to_bit_string(bits)
+    n = 2 * (len(bits) // 2)
+    if n == 0:
+        return ""
+    return format(xor_not_reverse_dynamic_count_int(int(bits, 2), len(bits)), f"0{n}b")
+
 def counts(bits: str):
     """Helper function: returns number of 0s and 1s in a bit string."""
     return bits.count('0'), bits.count('1')